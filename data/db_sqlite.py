@@ -1,9 +1,23 @@
 from __future__ import annotations
-import os, sqlite3, shutil, json
-from typing import Dict, List, Optional
+import os, sqlite3, json, csv
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from models.student import Student
 from models.instructor import Instructor
 from models.course import Course
+from models.validators import validate_age, validate_emails_bulk
+
+try:
+    import orjson  # optional: C-accelerated JSON, ~10x faster than the stdlib encoder
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional: incremental JSON parsing for very large files
+except ImportError:
+    ijson = None
 
 SCHEMA = """
 PRAGMA foreign_keys = ON;
@@ -36,23 +50,175 @@ CREATE TABLE IF NOT EXISTS registrations (
   FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
   FOREIGN KEY (course_id)  REFERENCES courses(course_id)  ON DELETE CASCADE
 );
+
+CREATE INDEX IF NOT EXISTS idx_students_name ON students(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_instructors_name ON instructors(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_courses_name ON courses(course_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_reg_course ON registrations(course_id);
+"""
+
+# Column order of SchoolDBSqlite.view_rows / view_columns
+VIEW_COLUMNS = ("kind", "id", "name", "age", "email", "extra")
+
+# Number of distinct search strings remembered by SchoolDBSqlite.search
+SEARCH_CACHE_SIZE = 64
+
+# Per-connection tuning: WAL needs one fsync per commit (instead of two) and lets
+# readers run alongside a writer; NORMAL sync is still crash-safe under WAL.
+# busy_timeout makes a locked database wait up to 5 s instead of failing at once.
+PRAGMAS = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -64000;
+PRAGMA mmap_size = 268435456;
+PRAGMA foreign_keys = ON;
+PRAGMA busy_timeout = 5000;
 """
 
+# Statements are kept as constants so every call site hands sqlite3 the exact
+# same text and hits the connection's prepared-statement cache.
+_SQL_SEL_STUDENTS = "SELECT student_id,name,age,email FROM students"
+_SQL_SEL_INSTRUCTORS = "SELECT instructor_id,name,age,email FROM instructors"
+_SQL_SEL_COURSES = "SELECT course_id,course_name,instructor_id FROM courses"
+_SQL_SEL_REGISTRATIONS = "SELECT student_id, course_id FROM registrations"
+_SQL_SEL_COURSES_WITH_REGS = (
+    "SELECT c.course_id, c.course_name, c.instructor_id, r.student_id "
+    "FROM courses c LEFT JOIN registrations r ON r.course_id = c.course_id"
+)
+_SQL_INS_STUDENT = "INSERT INTO students(student_id,name,age,email) VALUES (?,?,?,?)"
+_SQL_INS_INSTRUCTOR = "INSERT INTO instructors(instructor_id,name,age,email) VALUES (?,?,?,?)"
+_SQL_INS_COURSE = "INSERT INTO courses(course_id,course_name,instructor_id) VALUES (?,?,?)"
+_SQL_INS_REGISTRATION = "INSERT OR IGNORE INTO registrations(student_id, course_id) VALUES (?,?)"
+_SQL_SET_COURSE_INSTRUCTOR = "UPDATE courses SET instructor_id=? WHERE course_id=?"
+_SQL_DEL_STUDENT = "DELETE FROM students WHERE student_id=?"
+_SQL_DEL_INSTRUCTOR = "DELETE FROM instructors WHERE instructor_id=?"
+_SQL_DEL_COURSE = "DELETE FROM courses WHERE course_id=?"
+_SQL_RENAME_STUDENT = "UPDATE students SET student_id=? WHERE student_id=?"
+_SQL_RENAME_STUDENT_REGS = "UPDATE registrations SET student_id=? WHERE student_id=?"
+_SQL_UPD_STUDENT = "UPDATE students SET name=?, age=?, email=? WHERE student_id=?"
+_SQL_RENAME_INSTRUCTOR = "UPDATE instructors SET instructor_id=? WHERE instructor_id=?"
+_SQL_RENAME_INSTRUCTOR_COURSES = "UPDATE courses SET instructor_id=? WHERE instructor_id=?"
+_SQL_UPD_INSTRUCTOR = "UPDATE instructors SET name=?, age=?, email=? WHERE instructor_id=?"
+_SQL_RENAME_COURSE_REGS = "UPDATE registrations SET course_id=? WHERE course_id=?"
+_SQL_UPD_COURSE = "UPDATE courses SET course_id=?, course_name=?, instructor_id=? WHERE course_id=?"
+# (file suffix, query) per CSV written by export_csv; rows stream straight from the cursor
+_CSV_EXPORTS = (
+    ("students", _SQL_SEL_STUDENTS),
+    ("instructors", _SQL_SEL_INSTRUCTORS),
+    ("courses", _SQL_SEL_COURSES),
+    ("enrollments", _SQL_SEL_REGISTRATIONS),
+)
+# referencing tables first, so the foreign keys never see a dangling row
+_SQL_CLEAR_TABLES = (
+    "DELETE FROM registrations",
+    "DELETE FROM courses",
+    "DELETE FROM students",
+    "DELETE FROM instructors",
+)
+
+# save_json layout: version 2 keeps scalar fields per entity and lists the
+# registrations once at the top level; files without "version" use the old
+# per-entity id lists and are still accepted by load_json.
+JSON_VERSION = 2
+
+# Write buffer of each CSV file, so the rows reach the OS in large blocks.
+CSV_BUFFER_BYTES = 1 << 20
+
+# Pages copied per step of an online backup; progress is reported between steps.
+BACKUP_STEP_PAGES = 256
+
+# JSON files at least this large are parsed incrementally when ijson is installed,
+# so memory holds the row tuples rather than the whole parsed document as well.
+JSON_STREAM_BYTES = 64 * 1024 * 1024
+
+# Length of the substrings indexed for search; shorter queries fall back to a scan.
+TRIGRAM = 3
+
+
+def _build_index(entries):
+    """Build ``(objs, fields, grams)`` for ``search`` from ``(obj, *fields)`` tuples:
+    ``fields[n]`` holds the lowercased fields of ``objs[n]`` and ``grams`` maps each
+    trigram to the positions whose fields contain it."""
+    objs, fields = [], []
+    grams: Dict[str, set] = {}
+    for pos, (obj, *texts) in enumerate(entries):
+        lowered = tuple(t.lower() for t in texts)
+        objs.append(obj)
+        fields.append(lowered)
+        for text in lowered:
+            for k in range(len(text) - TRIGRAM + 1):
+                grams.setdefault(text[k:k + TRIGRAM], set()).add(pos)
+    return objs, fields, grams
+
+
+def _match_index(entry, t: str) -> list:
+    """Return the objects of an index entry whose fields contain ``t`` (already lowercased)."""
+    objs, fields, grams = entry
+    if len(t) < TRIGRAM:
+        return [obj for obj, lowered in zip(objs, fields) if any(t in f for f in lowered)]
+    candidates = None
+    for k in range(len(t) - TRIGRAM + 1):
+        posting = grams.get(t[k:k + TRIGRAM])
+        if not posting:
+            return []
+        candidates = set(posting) if candidates is None else candidates & posting
+    return [objs[pos] for pos in sorted(candidates) if any(t in f for f in fields[pos])]
+
+
 class SchoolDBSqlite:
+    def view_columns(self) -> Dict[str, list]:
+        """Return the table view as parallel column lists keyed by ``VIEW_COLUMNS``.
+        The columns are rebuilt only after a write, so repeated repaints share the same
+        lists; callers must treat them as read-only."""
+        if self._view_cache is not None and self._view_cache[0] == self._version:
+            return self._view_cache[1]
+        students, instructors, courses = self.students, self.instructors, self.courses
+        n_s, n_i = len(students), len(instructors)
+        cols = {
+            "kind": ["Student"] * n_s + ["Instructor"] * n_i + ["Course"] * len(courses),
+            "id": [*students, *instructors, *courses],
+            "name": [s.name for s in students.values()] + [i.name for i in instructors.values()]
+                    + [c.course_name for c in courses.values()],
+            "age": [s.age for s in students.values()] + [i.age for i in instructors.values()]
+                   + [""] * len(courses),
+            "email": [s._email for s in students.values()] + [i._email for i in instructors.values()]
+                     + [""] * len(courses),
+            "extra": [", ".join(c.course_id for c in s.registered_courses) for s in students.values()]
+                     + [", ".join(c.course_id for c in i.assigned_courses) for i in instructors.values()]
+                     + [c.instructor.name if c.instructor else "" for c in courses.values()],
+        }
+        self._view_cache = (self._version, cols)
+        return cols
+
     def view_rows(self):
         """Yield tuples for the table view: (type, id, name, age, email, courses_or_instructor)"""
-        # Students
-        for s in self.students.values():
-            courses = ", ".join(c.course_id for c in getattr(s, 'registered_courses', []))
-            yield ("Student", s.student_id, s.name, s.age, getattr(s, '_email', getattr(s, 'email', '')), courses)
-        # Instructors
-        for i in self.instructors.values():
-            courses = ", ".join(c.course_id for c in getattr(i, 'assigned_courses', []))
-            yield ("Instructor", i.instructor_id, i.name, i.age, getattr(i, '_email', getattr(i, 'email', '')), courses)
-        # Courses
-        for c in self.courses.values():
-            instr = c.instructor.name if c.instructor else ""
-            yield ("Course", c.course_id, c.course_name, "", "", instr)
+        cols = self.view_columns()
+        return zip(*(cols[k] for k in VIEW_COLUMNS))
+
+    def view_row(self, kind: str, key: str) -> tuple:
+        """Return the ``view_rows`` tuple of one cached record. ``kind`` is the value of
+        the first column: ``"Student"``, ``"Instructor"`` or ``"Course"``."""
+        if kind == "Course":
+            c = self.courses[key]
+            return kind, key, c.course_name, "", "", c.instructor.name if c.instructor else ""
+        if kind == "Student":
+            obj = self.students[key]
+            linked = obj.registered_courses
+        else:
+            obj = self.instructors[key]
+            linked = obj.assigned_courses
+        return kind, key, obj.name, obj.age, obj._email, ", ".join(c.course_id for c in linked)
+
+    def view_rows_fast(self) -> List[tuple]:
+        """``view_rows`` materialized as a list of display-order tuples, built once per
+        write and shared between callers (treat it as read-only)."""
+        if self._view_rows is not None and self._view_rows[0] == self._version:
+            return self._view_rows[1]
+        rows = list(self.view_rows())
+        self._view_rows = (self._version, rows)
+        return rows
+
     def get_students(self):
         """Return a list of students as dicts."""
         return [s.to_dict() for s in self.students.values()]
@@ -64,6 +230,24 @@ class SchoolDBSqlite:
     def get_courses(self):
         """Return a list of courses as dicts."""
         return [c.to_dict() for c in self.courses.values()]
+
+    def get_all_picklists(self):
+        """Return ``(students, courses, instructors)`` as lists of ``(id, name)`` pairs,
+        read from the cache in one call for filling pick lists."""
+        return ([(sid, s.name) for sid, s in self.students.items()],
+                [(cid, c.course_name) for cid, c in self.courses.items()],
+                [(iid, i.name) for iid, i in self.instructors.items()])
+
+    def get_instructor(self, instructor_id: Optional[str]) -> Optional[Instructor]:
+        """Return the cached instructor with this id, or None (also for an empty id)."""
+        return self.instructors.get(instructor_id) if instructor_id else None
+
+    def _rows_as_dicts(self, sql: str) -> List[dict]:
+        """Return the rows of ``sql`` as dicts keyed by column name (used by ``to_dict``)."""
+        cur = self.conn.execute(sql)
+        cols = [d[0] for d in cur.description]
+        return [dict(zip(cols, r)) for r in cur.fetchall()]
+
     """
     SQLite-backed DB with an in-memory object cache to keep GUI code simple.
     Exposes the same attributes/methods the GUIs already use:
@@ -73,222 +257,655 @@ class SchoolDBSqlite:
       - search()
       - save_json(path) / load_json(path)
       - backup_db(path)
+      - write_json / read_json + import_rows / backup_file  (the parts that are safe on a worker thread)
+      - bulk()  (batch many writes into one transaction)
     """
     def __init__(self, db_path: str = "school.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.execute("PRAGMA foreign_keys = ON;")
+        self.conn = sqlite3.connect(self.db_path, cached_statements=256)
+        # row_factory stays at the default: the loaders unpack plain tuples positionally,
+        # which is faster than sqlite3.Row (about 30% slower on a 200k-row load).
+        self.conn.executescript(PRAGMAS)
         self._ensure_schema()
     
         self.students: Dict[str, Student] = {}
         self.instructors: Dict[str, Instructor] = {}
         self.courses: Dict[str, Course] = {}
+        # bumped on every write; cached search results from an older version are stale
+        self._version = 0
+        # per-collection write counters, so views that only list one kind (e.g. the
+        # GUI comboboxes) can skip rebuilding when that kind has not changed
+        self.versions: Dict[str, int] = {"students": 0, "instructors": 0, "courses": 0}
+        self._search_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._view_cache: Optional[tuple] = None
+        self._view_rows: Optional[tuple] = None
+        # kind -> (versions[kind], index); see _text_index
+        self._text_idx: Dict[str, tuple] = {}
+        self._in_bulk = False
         self.refresh_cache()
 
     
     def _ensure_schema(self):
         cur = self.conn.cursor()
         cur.executescript(SCHEMA)
+        # gather planner statistics where they are missing or stale (cheap when current)
+        cur.execute("PRAGMA optimize=0x10002")
+        self.conn.commit()
+
+    def _commit(self, *kinds: str):
+        """Commit the pending write and invalidate version-keyed caches.
+        ``kinds`` names the collections whose rows changed (see ``versions``).
+        Inside ``bulk()`` the commit is deferred to the end of the block."""
+        if not self._in_bulk:
+            self.conn.commit()
+        self._version += 1
+        for kind in kinds:
+            self.versions[kind] += 1
+
+    @contextmanager
+    def bulk(self):
+        """Run many writes as one transaction, committing once on exit.
+
+        Use it around importers that call ``add_*`` / ``register_*`` in a loop::
+
+            with db.bulk():
+                for row in csv_rows:
+                    db.add_student(Student(...))
+
+        If the block raises, the transaction is rolled back and the cache is reloaded
+        from the database so it does not keep the discarded rows."""
+        if self._in_bulk:
+            yield self
+            return
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        self._in_bulk = True
+        try:
+            yield self
+        except BaseException:
+            self._in_bulk = False
+            self.conn.rollback()
+            self.refresh_cache()
+            raise
+        self._in_bulk = False
         self.conn.commit()
 
     
-    def refresh_cache(self):
+    def _unlink_cache(self):
+        """Empty the relation dicts of every cached object, then the caches.
+        Students, courses and instructors point at each other, so without this a
+        dropped cache stays in memory until the cyclic garbage collector runs."""
+        for s in self.students.values():
+            s.registered_courses.clear()
+        for i in self.instructors.values():
+            i.assigned_courses.clear()
+        for c in self.courses.values():
+            c.enrolled_students.clear()
         self.students.clear()
         self.instructors.clear()
         self.courses.clear()
 
+    def refresh_cache(self) -> Dict[str, int]:
+        """Reload the object cache from SQLite and return the bumped ``versions``."""
+        self._version += 1
+        for kind in self.versions:
+            self.versions[kind] += 1
+        self._unlink_cache()
+
         cur = self.conn.cursor()
 
-        
-        for sid, name, age, email in cur.execute("SELECT student_id,name,age,email FROM students"):
-            self.students[sid] = Student(name, int(age), email, sid)
+        # stored rows were validated when written (possibly under an older, looser
+        # email rule), so they are loaded as they are
+        self.students.update(
+            (sid, Student(name, int(age), email, sid, validate=False))
+            for sid, name, age, email in cur.execute(_SQL_SEL_STUDENTS))
+        self.instructors.update(
+            (iid, Instructor(name, int(age), email, iid, validate=False))
+            for iid, name, age, email in cur.execute(_SQL_SEL_INSTRUCTORS))
+
+        # One pass over courses LEFT JOIN registrations: each course is built the
+        # first time it is seen and its enrolments are attached as rows stream by.
+        courses = self.courses
+        for cid, cname, iid, sid in cur.execute(_SQL_SEL_COURSES_WITH_REGS):
+            c = courses.get(cid)
+            if c is None:
+                instr = self.instructors.get(iid) if iid else None
+                c = courses[cid] = Course(cid, cname, instr)
+                c.bind_instructors(self.instructors)
+                if instr:
+                    instr.assign_course(c)
+            s = self.students.get(sid) if sid else None
+            if s:
+                s.register_course(c)
+                c.add_student(s)
+        return dict(self.versions)
 
-        for iid, name, age, email in cur.execute("SELECT instructor_id,name,age,email FROM instructors"):
-            self.instructors[iid] = Instructor(name, int(age), email, iid)
 
+    
+    def _add_student_rows(self, rows):
+        """Insert ``(student_id, name, age, email)`` rows. Does not commit."""
+        self.conn.executemany(_SQL_INS_STUDENT, rows)
 
-        for cid, cname, iid in cur.execute("SELECT course_id,course_name,instructor_id FROM courses"):
-            instr = self.instructors.get(iid) if iid else None
-            self.courses[cid] = Course(cid, cname, instr)
+    def _add_instructor_rows(self, rows):
+        """Insert ``(instructor_id, name, age, email)`` rows. Does not commit."""
+        self.conn.executemany(_SQL_INS_INSTRUCTOR, rows)
 
-        
-        for i in self.instructors.values():
-            i.assigned_courses.clear()
-        for c in self.courses.values():
-            if c.instructor:
-                c.instructor.assign_course(c)
+    def _add_course_rows(self, rows):
+        """Insert ``(course_id, course_name, instructor_id)`` rows. Does not commit."""
+        self.conn.executemany(_SQL_INS_COURSE, rows)
 
-        
-        for c in self.courses.values():
-            c.enrolled_students.clear()
-        for sid, cid in cur.execute("SELECT student_id, course_id FROM registrations"):
-            s = self.students.get(sid)
-            c = self.courses.get(cid)
-            if s and c:
-                if c not in s.registered_courses:
-                    s.register_course(c)
-                if s not in c.enrolled_students:
-                    c.enrolled_students.append(s)
+    def _add_registration_rows(self, rows):
+        """Insert ``(student_id, course_id)`` rows, skipping existing ones. Does not commit."""
+        self.conn.executemany(_SQL_INS_REGISTRATION, rows)
 
     
     def add_student(self, s: Student):
-        self.conn.execute(
-            "INSERT INTO students(student_id,name,age,email) VALUES (?,?,?,?)",
-            (s.student_id, s.name, s.age, s._email),
-        )
-        self.conn.commit()
-        self.refresh_cache()
+        self._add_student_rows([(s.student_id, s.name, s.age, s._email)])
+        self._commit("students")
+        self.students[s.student_id] = s
 
     
     def add_instructor(self, i: Instructor):
-        self.conn.execute(
-            "INSERT INTO instructors(instructor_id,name,age,email) VALUES (?,?,?,?)",
-            (i.instructor_id, i.name, i.age, i._email),
-        )
-        self.conn.commit()
-        self.refresh_cache()
+        self._add_instructor_rows([(i.instructor_id, i.name, i.age, i._email)])
+        self._commit("instructors")
+        self.instructors[i.instructor_id] = i
 
     
     def add_course(self, c: Course):
         iid = c.instructor.instructor_id if c.instructor else None
-        self.conn.execute(
-            "INSERT INTO courses(course_id,course_name,instructor_id) VALUES (?,?,?)",
-            (c.course_id, c.course_name, iid),
-        )
-        self.conn.commit()
-        self.refresh_cache()
+        self._add_course_rows([(c.course_id, c.course_name, iid)])
+        self._commit("courses")
+        # link to the cached instructor so both sides of the relation stay in sync
+        c.bind_instructors(self.instructors)
+        c.instructor = self.instructors.get(iid) if iid else None
+        if c.instructor:
+            c.instructor.assign_course(c)
+        self.courses[c.course_id] = c
 
     
     def register_student_in_course(self, student_id: str, course_id: str):
-        self.conn.execute(
-            "INSERT OR IGNORE INTO registrations(student_id, course_id) VALUES (?,?)",
-            (student_id, course_id),
-        )
-        self.conn.commit()
-        self.refresh_cache()
+        self._add_registration_rows([(student_id, course_id)])
+        self._commit()
+        s = self.students.get(student_id)
+        c = self.courses.get(course_id)
+        if s and c:
+            s.register_course(c)
+            c.add_student(s)
 
     def assign_instructor_to_course(self, instructor_id: str, course_id: str):
-        self.conn.execute(
-            "UPDATE courses SET instructor_id=? WHERE course_id=?",
-            (instructor_id, course_id),
-        )
-        self.conn.commit()
-        self.refresh_cache()
+        self.conn.execute(_SQL_SET_COURSE_INSTRUCTOR, (instructor_id, course_id))
+        self._commit()
+        c = self.courses.get(course_id)
+        if c:
+            self._relink_instructor(c, self.instructors.get(instructor_id))
+
+    def register_students_bulk(self, pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Register many ``(student_id, course_id)`` pairs with one executemany.
+        Pairs naming a student or course that does not exist are skipped rather than
+        failing the batch; they are returned."""
+        valid, skipped = [], []
+        for pair in pairs:
+            (valid if pair[0] in self.students and pair[1] in self.courses else skipped).append(pair)
+        with self.bulk():
+            self._add_registration_rows(valid)
+            self._commit()
+        for student_id, course_id in valid:
+            s = self.students[student_id]
+            c = self.courses[course_id]
+            s.register_course(c)
+            c.add_student(s)
+        return skipped
+
+    def assign_instructors_bulk(self, pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Apply many ``(instructor_id, course_id)`` assignments with one executemany.
+        A course listed twice ends up with the last instructor, as in SQL. Pairs naming
+        an instructor or course that does not exist are skipped and returned."""
+        valid, skipped = [], []
+        for pair in pairs:
+            (valid if pair[0] in self.instructors and pair[1] in self.courses else skipped).append(pair)
+        with self.bulk():
+            self.conn.executemany(_SQL_SET_COURSE_INSTRUCTOR, valid)
+            self._commit()
+        for instructor_id, course_id in valid:
+            self._relink_instructor(self.courses[course_id], self.instructors[instructor_id])
+        return skipped
+
+    @staticmethod
+    def _drop_extra(objs):
+        """Clear the cached display strings (``_extra_cache``) of ``objs``."""
+        for obj in objs:
+            obj._extra_cache = None
+
+    def _relink_instructor(self, c: Course, instr: Optional[Instructor]):
+        """Move course ``c`` from its current instructor to ``instr`` in the cache.
+        Nothing changes when ``instr`` already teaches ``c``, so the course keeps its
+        place in ``assigned_courses``."""
+        if c.instructor is instr:
+            return
+        if c.instructor:
+            c.instructor.assigned_courses.pop(c, None)
+            c.instructor._extra_cache = None
+        c.instructor = instr
+        if instr:
+            instr.assign_course(c)
 
     
     def search(self, text: str) -> Dict[str, List]:
+        """Case-insensitive substring search on names and IDs.
+        Matches against lowercased copies of the fields built once per write (see
+        ``_text_index``); queries of ``TRIGRAM`` characters or more only verify the rows
+        whose trigrams all occur in the query."""
         t = (text or "").lower()
-        
-        res = {
-            "students": [s for s in self.students.values() if t in s.name.lower() or t in s.student_id.lower()],
-            "instructors": [i for i in self.instructors.values() if t in i.name.lower() or t in i.instructor_id.lower()],
-            "courses": [c for c in self.courses.values() if t in c.course_name.lower() or t in c.course_id.lower()],
+        if not t:
+            # every row matches the empty string; skip the index and the result cache
+            return {"students": list(self.students.values()),
+                    "instructors": list(self.instructors.values()),
+                    "courses": list(self.courses.values())}
+        # names and ids only change with their own kind, so registrations and
+        # assignments leave both the index and the cached results valid
+        stamp = tuple(self.versions.values())
+        hit = self._search_cache.get(t)
+        if hit is not None and hit[0] == stamp:
+            self._search_cache.move_to_end(t)
+            return {k: list(v) for k, v in hit[1].items()}
+
+        index = self._text_index()
+        res = {kind: _match_index(entry, t) for kind, entry in index.items()}
+        self._search_cache[t] = (stamp, res)
+        self._search_cache.move_to_end(t)
+        while len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return {k: list(v) for k, v in res.items()}
+
+    
+    def _text_index(self) -> Dict[str, tuple]:
+        """Lowercased search fields and trigram postings per entity kind, rebuilt lazily
+        after writes so the per-keystroke cost never includes ``str.lower``. Each kind
+        is rebuilt only when its own ``versions`` counter moved."""
+        sources = {
+            "students": lambda: [(s, s.name, s.student_id) for s in self.students.values()],
+            "instructors": lambda: [(i, i.name, i.instructor_id) for i in self.instructors.values()],
+            "courses": lambda: [(c, c.course_name, c.course_id) for c in self.courses.values()],
         }
-        return res
+        index = {}
+        for kind, entries in sources.items():
+            version = self.versions[kind]
+            built = self._text_idx.get(kind)
+            if built is None or built[0] != version:
+                built = self._text_idx[kind] = (version, _build_index(entries()))
+            index[kind] = built[1]
+        return index
 
     
     def delete_student(self, student_id: str):
-        self.conn.execute("DELETE FROM students WHERE student_id=?", (student_id,))
-        self.conn.commit()
-        self.refresh_cache()
+        self.conn.execute(_SQL_DEL_STUDENT, (student_id,))
+        self._commit("students")
+        s = self.students.pop(student_id, None)
+        if s:
+            # registrations are removed by ON DELETE CASCADE
+            for c in s.registered_courses:
+                c.enrolled_students.pop(s, None)
+            self._drop_extra(s.registered_courses)
 
     def delete_instructor(self, instructor_id: str):
-        self.conn.execute("DELETE FROM instructors WHERE instructor_id=?", (instructor_id,))
-        self.conn.commit()
-        self.refresh_cache()
+        self.conn.execute(_SQL_DEL_INSTRUCTOR, (instructor_id,))
+        self._commit("instructors")
+        i = self.instructors.pop(instructor_id, None)
+        if i:
+            # courses.instructor_id is cleared by ON DELETE SET NULL
+            for c in i.assigned_courses:
+                c.instructor = None
 
     def delete_course(self, course_id: str):
-        self.conn.execute("DELETE FROM courses WHERE course_id=?", (course_id,))
-        self.conn.commit()
-        self.refresh_cache()
+        self.conn.execute(_SQL_DEL_COURSE, (course_id,))
+        self._commit("courses")
+        c = self.courses.pop(course_id, None)
+        if c:
+            for s in c.enrolled_students:
+                s.registered_courses.pop(c, None)
+            self._drop_extra(c.enrolled_students)
+            if c.instructor:
+                c.instructor.assigned_courses.pop(c, None)
+                c.instructor._extra_cache = None
+
+    def _begin_rename(self):
+        """Open the write transaction if needed and defer foreign key checks to its
+        commit. The schema has no ON UPDATE CASCADE, so an id and the rows referencing
+        it are renamed by separate statements that are only consistent together."""
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        self.conn.execute("PRAGMA defer_foreign_keys = ON")
 
-  
     def update_student(self, old_id: str, s: Student):
         cur = self.conn.cursor()
         
         if old_id != s.student_id:
-            cur.execute("UPDATE students SET student_id=? WHERE student_id=?", (s.student_id, old_id))
+            self._begin_rename()
+            cur.execute(_SQL_RENAME_STUDENT, (s.student_id, old_id))
            
-            cur.execute("UPDATE registrations SET student_id=? WHERE student_id=?", (s.student_id, old_id))
-        cur.execute("UPDATE students SET name=?, age=?, email=? WHERE student_id=?",
+            cur.execute(_SQL_RENAME_STUDENT_REGS, (s.student_id, old_id))
+        cur.execute(_SQL_UPD_STUDENT,
                     (s.name, s.age, s._email, s.student_id))
-        self.conn.commit()
-        self.refresh_cache()
+        self._commit("students")
+        self._recache_student(old_id, s)
+
+    def _recache_student(self, old_id: str, s: Student):
+        # update the cached object in place so course back-references stay valid
+        cached = self.students.pop(old_id, None)
+        if cached is None:
+            self.students[s.student_id] = s
+            return
+        cached.name, cached.age, cached._email = s.name, s.age, s._email
+        cached.student_id, cached._combo_label = s.student_id, s._combo_label
+        self.students[s.student_id] = cached
 
     def update_instructor(self, old_id: str, i: Instructor):
         cur = self.conn.cursor()
         if old_id != i.instructor_id:
-            cur.execute("UPDATE instructors SET instructor_id=? WHERE instructor_id=?", (i.instructor_id, old_id))
-            cur.execute("UPDATE courses SET instructor_id=? WHERE instructor_id=?", (i.instructor_id, old_id))
-        cur.execute("UPDATE instructors SET name=?, age=?, email=? WHERE instructor_id=?",
+            self._begin_rename()
+            cur.execute(_SQL_RENAME_INSTRUCTOR, (i.instructor_id, old_id))
+            cur.execute(_SQL_RENAME_INSTRUCTOR_COURSES, (i.instructor_id, old_id))
+        cur.execute(_SQL_UPD_INSTRUCTOR,
                     (i.name, i.age, i._email, i.instructor_id))
-        self.conn.commit()
-        self.refresh_cache()
+        self._commit("instructors")
+        self._recache_instructor(old_id, i)
+
+    def _recache_instructor(self, old_id: str, i: Instructor):
+        cached = self.instructors.pop(old_id, None)
+        if cached is None:
+            self.instructors[i.instructor_id] = i
+            return
+        cached.name, cached.age, cached._email = i.name, i.age, i._email
+        cached.instructor_id, cached._combo_label = i.instructor_id, i._combo_label
+        for c in cached.assigned_courses:
+            c.instructor_id = i.instructor_id
+        # course rows show the instructor's name
+        self._drop_extra(cached.assigned_courses)
+        self.instructors[i.instructor_id] = cached
 
     def update_course(self, old_id: str, c: Course):
         cur = self.conn.cursor()
         if old_id != c.course_id:
-            cur.execute("UPDATE registrations SET course_id=? WHERE course_id=?", (c.course_id, old_id))
+            self._begin_rename()
+            cur.execute(_SQL_RENAME_COURSE_REGS, (c.course_id, old_id))
         iid = c.instructor.instructor_id if c.instructor else None
-        cur.execute("UPDATE courses SET course_id=?, course_name=?, instructor_id=? WHERE course_id=?",
+        cur.execute(_SQL_UPD_COURSE,
                     (c.course_id, c.course_name, iid, old_id))
-        self.conn.commit()
-        self.refresh_cache()
+        self._commit("courses")
+        self._recache_course(old_id, c)
+
+    def _recache_course(self, old_id: str, c: Course):
+        iid = c.instructor.instructor_id if c.instructor else None
+        instr = self.instructors.get(iid) if iid else None
+        cached = self.courses.pop(old_id, None)
+        if cached is None:
+            c.bind_instructors(self.instructors)
+            c.instructor = None
+            self._relink_instructor(c, instr)
+            self.courses[c.course_id] = c
+            return
+        cached.course_id, cached.course_name = c.course_id, c.course_name
+        cached._combo_label = c._combo_label
+        # student and instructor rows list course ids
+        if old_id != c.course_id:
+            self._drop_extra(cached.enrolled_students)
+            if cached.instructor:
+                cached.instructor._extra_cache = None
+        self._relink_instructor(cached, instr)
+        self.courses[c.course_id] = cached
+
+    # Bulk variants of update_*: ``updates`` is an iterable of ``(old_id, new)``.
+    # Entries that keep their id are written with one executemany; the rare renames
+    # go through update_* one by one. Either way it is a single transaction.
+
+    def update_students_bulk(self, updates: Iterable[Tuple[str, Student]]):
+        with self.bulk():
+            same = []
+            for old_id, s in updates:
+                if old_id == s.student_id:
+                    same.append(s)
+                else:
+                    self.update_student(old_id, s)
+            self.conn.executemany(_SQL_UPD_STUDENT,
+                                  [(s.name, s.age, s._email, s.student_id) for s in same])
+            self._commit("students")
+        for s in same:
+            self._recache_student(s.student_id, s)
+
+    def update_instructors_bulk(self, updates: Iterable[Tuple[str, Instructor]]):
+        with self.bulk():
+            same = []
+            for old_id, i in updates:
+                if old_id == i.instructor_id:
+                    same.append(i)
+                else:
+                    self.update_instructor(old_id, i)
+            self.conn.executemany(_SQL_UPD_INSTRUCTOR,
+                                  [(i.name, i.age, i._email, i.instructor_id) for i in same])
+            self._commit("instructors")
+        for i in same:
+            self._recache_instructor(i.instructor_id, i)
+
+    def update_courses_bulk(self, updates: Iterable[Tuple[str, Course]]):
+        with self.bulk():
+            same = []
+            for old_id, c in updates:
+                if old_id == c.course_id:
+                    same.append(c)
+                else:
+                    self.update_course(old_id, c)
+            self.conn.executemany(_SQL_UPD_COURSE, [
+                (c.course_id, c.course_name, c.instructor.instructor_id if c.instructor else None, c.course_id)
+                for c in same])
+            self._commit("courses")
+        for c in same:
+            self._recache_course(c.course_id, c)
 
     
     def to_dict(self) -> dict:
+        """Serialize the database in the ``JSON_VERSION`` layout: one scalar row per entity
+        plus a single ``registrations`` list, each read in one pass over its table."""
         return {
-            "students": [s.to_dict() for s in self.students.values()],
-            "instructors": [i.to_dict() for i in self.instructors.values()],
-            "courses": [c.to_dict() for c in self.courses.values()],
+            "version": JSON_VERSION,
+            "students": self._rows_as_dicts(_SQL_SEL_STUDENTS),
+            "instructors": self._rows_as_dicts(_SQL_SEL_INSTRUCTORS),
+            "courses": self._rows_as_dicts(_SQL_SEL_COURSES),
+            "registrations": self._rows_as_dicts(_SQL_SEL_REGISTRATIONS),
         }
 
     def save_json(self, path: str):
+        self.write_json(self.to_dict(), path)
+
+    @staticmethod
+    def write_json(data: dict, path: str):
+        """Write a ``to_dict`` snapshot to ``path``. Touches no connection, so the
+        encoding and file I/O can run on a worker thread."""
+        if orjson is not None:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
         with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2)
+            json.dump(data, f, indent=2)
+
+    @staticmethod
+    def read_json(path: str) -> Dict[str, list]:
+        """Parse and validate a JSON file into the row lists ``import_rows`` inserts.
+        Reads both the current layout (top-level ``registrations``) and legacy files that
+        carry ``enrolled_student_ids`` on each course. Touches no connection, so it can
+        run on a worker thread; a bad record raises before any SQL runs."""
+        if ijson is not None and os.path.getsize(path) >= JSON_STREAM_BYTES:
+            return SchoolDBSqlite._read_json_stream(path)
+        if orjson is not None:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        return SchoolDBSqlite._json_rows(
+            data.get("version", 1), data.get("students", []), data.get("instructors", []),
+            data.get("courses", []), lambda: data.get("registrations", []))
+
+    @staticmethod
+    def _read_json_stream(path: str) -> Dict[str, list]:
+        """``read_json`` through ijson: each top-level list is streamed item by item
+        (one pass over the file per list), so the parsed document never exists whole."""
+        with open(path, "rb") as f:
+            def items(prefix):
+                f.seek(0)
+                yield from ijson.items(f, prefix, use_float=True)
+
+            version = next(items("version"), 1)
+            return SchoolDBSqlite._json_rows(
+                version, items("students.item"), items("instructors.item"),
+                items("courses.item"), lambda: items("registrations.item"))
+
+    @staticmethod
+    def _json_rows(version, students, instructors, courses, registrations) -> Dict[str, list]:
+        """Validate JSON records into ``import_rows`` row lists. ``students``,
+        ``instructors`` and ``courses`` are iterables of dicts, each consumed once and in
+        that order; ``registrations`` is a callable returning the version 2 pairs."""
+        # Validate here, for both parse paths, so a bad record aborts before any SQL runs.
+        student_rows = []
+        for sd in students:
+            age = int(sd["age"])
+            validate_age(age)
+            student_rows.append((sd["student_id"], sd["name"], age, sd["email"]))
+        instructor_rows = []
+        for idd in instructors:
+            age = int(idd["age"])
+            validate_age(age)
+            instructor_rows.append((idd["instructor_id"], idd["name"], age, idd["email"]))
+        # every email in one pass, once per record; snapshots may predate EMAIL_RE
+        validate_emails_bulk(chain((row[3] for row in student_rows), (row[3] for row in instructor_rows)),
+                             legacy=True)
+        instructor_ids = {row[0] for row in instructor_rows}
+        student_ids = frozenset(row[0] for row in student_rows)
+
+        course_rows = []
+        registration_rows = []
+        for cd in courses:
+            iid = cd.get("instructor_id")
+            course_rows.append((cd["course_id"], cd["course_name"], iid if iid in instructor_ids else None))
+            if version < 2:
+                # one C-level set intersection per course instead of a membership test per id
+                registration_rows.extend(
+                    (sid, cd["course_id"])
+                    for sid in student_ids.intersection(cd.get("enrolled_student_ids", ())))
+        if version >= 2:
+            course_ids = frozenset(row[0] for row in course_rows)
+            registration_rows = [
+                (rd["student_id"], rd["course_id"])
+                for rd in registrations()
+                if rd["student_id"] in student_ids and rd["course_id"] in course_ids
+            ]
+        return {
+            "students": student_rows,
+            "instructors": instructor_rows,
+            "courses": course_rows,
+            "registrations": registration_rows,
+        }
+
+    def import_rows(self, rows: Dict[str, list]):
+        """Replace the database contents with the row lists from ``read_json``."""
+        # Replace the whole dataset in one transaction: one commit instead of one per row.
+        cur = self.conn.cursor()
+        try:
+            # take the write lock up front rather than failing on upgrade halfway through
+            cur.execute("BEGIN IMMEDIATE")
+            for sql in _SQL_CLEAR_TABLES:
+                cur.execute(sql)
+
+            self._add_student_rows(rows["students"])
+            self._add_instructor_rows(rows["instructors"])
+            self._add_course_rows(rows["courses"])
+            self._add_registration_rows(rows["registrations"])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.refresh_cache()
 
     @classmethod
-    def load_json(cls, path: str, db_path: str = "school.db") -> "SchoolDBSqlite":
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        db = cls(db_path)
-        
-        cur = db.conn.cursor()
-        cur.executescript("""
-            DELETE FROM registrations;
-            DELETE FROM courses;
-            DELETE FROM students;
-            DELETE FROM instructors;
-        """)
-        
-        for sd in data.get("students", []):
-            s = Student.from_dict(sd)
-            db.add_student(s)
-        
-        for idd in data.get("instructors", []):
-            i = Instructor.from_dict(idd)
-            db.add_instructor(i)
-       
-        for cd in data.get("courses", []):
-            instr = db.instructors.get(cd.get("instructor_id")) if cd.get("instructor_id") else None
-            c = Course.from_dict(cd, instr)
-            db.add_course(c)
-       
-        for cd in data.get("courses", []):
-            for sid in cd.get("enrolled_student_ids", []):
-                if sid in db.students:
-                    db.register_student_in_course(sid, cd["course_id"])
-        db.refresh_cache()
+    def load_json(cls, path: str, db_path: str = "school.db", *,
+                  into: Optional["SchoolDBSqlite"] = None) -> "SchoolDBSqlite":
+        """Replace the database contents with the records in a JSON file.
+        When ``into`` is given, its open connection and cache are reused (and ``db_path``
+        is ignored) instead of opening a second connection to the file."""
+        rows = cls.read_json(path)
+        db = into if into is not None else cls(db_path)
+        db.import_rows(rows)
         return db
 
+    def export_csv(self, prefix: str) -> Dict[str, str]:
+        """Write one CSV per table (``<prefix>_students.csv`` ...) and return
+        ``{table: path}``. See ``export_csv_file`` for a worker-thread variant."""
+        self.conn.commit()
+        return self._write_csv_tables(self.conn, prefix)
+
+    @staticmethod
+    def export_csv_file(db_path: str, prefix: str) -> Dict[str, str]:
+        """``export_csv`` for the database file at ``db_path`` through a private
+        connection, so it is safe to call from a worker thread."""
+        conn = sqlite3.connect(db_path)
+        try:
+            return SchoolDBSqlite._write_csv_tables(conn, prefix)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write_csv_tables(conn: sqlite3.Connection, prefix: str) -> Dict[str, str]:
+        created = {}
+        # one read transaction, so all files come from the same snapshot
+        conn.execute("BEGIN")
+        try:
+            for table, sql in _CSV_EXPORTS:
+                path = f"{prefix}_{table}.csv"
+                with open(path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_BYTES) as f:
+                    w = csv.writer(f)
+                    cur = conn.execute(sql)
+                    w.writerow([d[0] for d in cur.description])
+                    w.writerows(cur)
+                created[table] = path
+        finally:
+            conn.rollback()
+        return created
+
     
-    def backup_db(self, dest_path: str):
+    def backup_db(self, dest_path: str, progress: Optional[Callable[[int, int], None]] = None):
         
         self.conn.commit()
-        shutil.copy2(self.db_path, dest_path)
+        self._copy_pages(self.conn, dest_path, progress)
+
+    @staticmethod
+    def backup_file(db_path: str, dest_path: str,
+                    progress: Optional[Callable[[int, int], None]] = None):
+        """Back up the database file at ``db_path`` through a private connection.
+        Unlike ``backup_db`` this is safe to call from a worker thread; only data
+        committed before the call is copied. ``progress(remaining, total)`` is called
+        with page counts after every ``BACKUP_STEP_PAGES`` pages."""
+        src = sqlite3.connect(db_path)
+        try:
+            SchoolDBSqlite._copy_pages(src, dest_path, progress)
+        finally:
+            src.close()
+
+    @staticmethod
+    def _copy_pages(src: sqlite3.Connection, dest_path: str, progress=None):
+        # online backup API: copies pages in C and sees the WAL, unlike a plain file copy
+        dst = sqlite3.connect(dest_path)
+        try:
+            src.backup(dst, pages=BACKUP_STEP_PAGES,
+                       progress=(lambda _status, remaining, total: progress(remaining, total))
+                       if progress else None)
+        finally:
+            dst.close()
 
     def close(self):
+        self._unlink_cache()
         try:
+            self.conn.commit()
+            # let SQLite refresh planner statistics for the queries this session ran
+            self.conn.execute("PRAGMA optimize")
             self.conn.close()
         except Exception:
             pass
@@ -1,17 +1,141 @@
 from __future__ import annotations
+import os
+import queue
 import tkinter as tk
+from itertools import chain, islice, zip_longest
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox, filedialog
 from data.db_sqlite import SchoolDBSqlite  # NEW
 from models.student import Student
 from models.instructor import Instructor
 from models.course import Course
 
+_combo_label = attrgetter("_combo_label")
+
+# fixed Treeview row height in pixels, so the rows on screen follow from the widget height
+ROW_HEIGHT = 20
+
+# grid options shared by the label/field rows of the forms, see SchoolApp._rows
+_LABEL_GRID = {"column": 0, "sticky": "w", "padx": 4, "pady": 4}
+_FIELD_GRID = {"column": 1, "sticky": "ew", "padx": 4, "pady": 4}
+_PICK_LABEL_GRID = {"column": 0, "sticky": "w", "padx": 5, "pady": 4}
+_PICK_FIELD_GRID = {"column": 1, "padx": 5, "pady": 4}
+
+
+class AutocompleteEntry(ttk.Entry):
+    """Entry with type-ahead suggestions, used where a read-only Combobox would list
+    every record. The choices stay in Python lists; typing pops up a Listbox with at
+    most ``limit`` matching labels, so Tk never holds more than that many items.
+    ``current()`` and ``set()`` behave like their ``ttk.Combobox`` counterparts;
+    ``current_id()`` gives the record id of the entered label."""
+
+    def __init__(self, master, limit=20, **kw):
+        super().__init__(master, **kw)
+        self.limit = limit
+        self._labels, self._ids, self._lowered, self._index = [], [], [], {}
+        self._popup = self._listbox = None
+        self.bind("<KeyRelease>", self._on_key)
+        self.bind("<Down>", self._focus_popup)
+        self.bind("<Escape>", lambda _e: self._hide())
+        self.bind("<FocusOut>", lambda _e: self.after(100, self._hide_unless_focused))
+
+    def set_choices(self, labels, ids):
+        """Replace the selectable ``labels``; ``ids[n]`` is the record id of ``labels[n]``."""
+        self._labels, self._ids = labels, ids
+        self._lowered = [label.lower() for label in labels]
+        self._index = {label: n for n, label in enumerate(labels)}
+
+    def current(self):
+        """Index of the entered label among the choices, or -1 if it is not one of them."""
+        return self._index.get(self.get(), -1)
+
+    def current_id(self):
+        """Record id of the entered label, or None if it is not one of the choices."""
+        idx = self.current()
+        return self._ids[idx] if idx != -1 else None
+
+    def set(self, text):
+        self.delete(0, tk.END)
+        self.insert(0, text)
+
+    def _on_key(self, event):
+        if event.keysym in ("Down", "Up", "Escape", "Return", "Tab"):
+            return
+        q = self.get().lower()
+        matches = list(islice((label for label, low in zip(self._labels, self._lowered) if q in low),
+                              self.limit))
+        if matches:
+            self._show(matches)
+        else:
+            self._hide()
+
+    def _show(self, matches):
+        if self._popup is None:
+            self._popup = tk.Toplevel(self)
+            self._popup.overrideredirect(True)
+            self._listbox = tk.Listbox(self._popup, exportselection=False)
+            self._listbox.pack(fill="both", expand=True)
+            self._listbox.bind("<ButtonRelease-1>", self._pick)
+            self._listbox.bind("<Return>", self._pick)
+            self._listbox.bind("<Escape>", lambda _e: (self._hide(), self.focus_set()))
+        lb = self._listbox
+        lb.delete(0, tk.END)
+        lb.insert(tk.END, *matches)
+        lb.configure(height=len(matches), width=self["width"] or 40)
+        self._popup.geometry(f"+{self.winfo_rootx()}+{self.winfo_rooty() + self.winfo_height()}")
+        self._popup.deiconify()
+        self._popup.lift()
+
+    def _hide(self):
+        if self._popup is not None:
+            self._popup.withdraw()
+
+    def _hide_unless_focused(self):
+        try:
+            focused = self.focus_get()
+        except KeyError:  # focus is in a widget tkinter does not know, e.g. a dialog
+            focused = None
+        if focused is not self._listbox:
+            self._hide()
+
+    def _focus_popup(self, _event):
+        if self._popup is not None and self._popup.winfo_ismapped():
+            self._listbox.focus_set()
+            self._listbox.selection_set(0)
+            self._listbox.activate(0)
+
+    def _pick(self, _event):
+        sel = self._listbox.curselection()
+        if sel:
+            self.set(self._listbox.get(sel[0]))
+            self.icursor(tk.END)
+        self._hide()
+        self.focus_set()
+
+
 class SchoolApp(tk.Tk):
     def __init__(self, db: SchoolDBSqlite):
         super().__init__()
         self.title("School Management System")
         self.geometry("980x620")
         self.db = db
+        # db.versions seen when each kind's picker choices were last built
+        self._combo_cache = {"students": None, "instructors": None, "courses": None}
+        # iid -> values of every row in the current view; iids are "S:<id>", "I:<id>", "C:<id>".
+        # Only a window of them lives in the Treeview at a time, see _show_window
+        self._tree_rows = {}
+        self._row_order = []
+        self._shown = {}
+        self._top = 0
+        self._page = 18
+        self._selected = None
+        self._search_job = None
+        self._refresh_pending = False
+        self._edit_win = None
+        self._last_dir = None
+        # file I/O (JSON, backups) runs here so the Tk event loop keeps running
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
         self._make_menu()
         self._make_tabs()
         self.refresh_all()
@@ -28,49 +152,92 @@ class SchoolApp(tk.Tk):
         fmenu.add_command(label="Exit", command=self.destroy)
         menubar.add_cascade(label="File", menu=fmenu)
         self.config(menu=menubar)
+        self._menubar = menubar
+
+    def destroy(self):
+        self._io_pool.shutdown(wait=False)
+        super().destroy()
+
+    def _run_io(self, fn, *args, on_done, progress=False):
+        """Run ``fn(*args)`` on the I/O worker and hand its result to ``on_done`` on the
+        Tk thread. The File menu stays disabled until the job finishes.
+        With ``progress=True`` a ``progress(done, total)`` callback is appended to the
+        arguments and a progress bar at the bottom of the window follows it."""
+        self._menubar.entryconfig("File", state="disabled")
+        q = None
+        if progress:
+            # the worker only enqueues; the bar is updated from the Tk thread
+            q = queue.Queue()
+            args += (lambda remaining, total: q.put((total - remaining, total)),)
+            self._progress_bar.configure(value=0)
+            self._progress_bar.pack(side="bottom", fill="x", padx=10, pady=(0, 6), before=self.nb)
+        fut = self._io_pool.submit(fn, *args)
+        self.after(50, self._check_future, fut, on_done, q)
+
+    def _check_future(self, fut, on_done, q=None):
+        while q is not None and not q.empty():
+            done, total = q.get_nowait()
+            self._progress_bar.configure(value=100 * done / total if total else 100)
+        if not fut.done():
+            self.after(50, self._check_future, fut, on_done, q)
+            return
+        if q is not None:
+            self._progress_bar.pack_forget()
+        self._menubar.entryconfig("File", state="normal")
+        try:
+            on_done(fut.result())
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def _ask_path(self, dialog, **options):
+        """Show a file dialog starting in the folder of the last file picked."""
+        path = dialog(initialdir=self._last_dir, **options)
+        if path:
+            self._last_dir = os.path.dirname(path)
+        return path
 
     def on_open_db(self):
-        path = filedialog.asksaveasfilename(defaultextension=".db",
-                                            filetypes=[("SQLite DB", "*.db"), ("All Files", "*.*")])
+        path = self._ask_path(filedialog.asksaveasfilename, defaultextension=".db",
+                              filetypes=[("SQLite DB", "*.db"), ("All Files", "*.*")])
         if not path: return
         try:
             self.db.close()
         except Exception:
             pass
         self.db = SchoolDBSqlite(path)
-        self.refresh_all()
+        self._combo_cache = dict.fromkeys(self._combo_cache)
+        self._schedule_refresh()
         messagebox.showinfo("Database", f"Connected to:\n{path}")
 
     def on_backup_db(self):
-        path = filedialog.asksaveasfilename(defaultextension=".db",
-                                            filetypes=[("SQLite DB", "*.db")])
+        path = self._ask_path(filedialog.asksaveasfilename, defaultextension=".db",
+                              filetypes=[("SQLite DB", "*.db")])
         if not path: return
-        try:
-            self.db.backup_db(path)
-            messagebox.showinfo("Backup", f"Database copied to:\n{path}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._run_io(SchoolDBSqlite.backup_file, self.db.db_path, path, progress=True,
+                     on_done=lambda _: messagebox.showinfo("Backup", f"Database copied to:\n{path}"))
 
     def on_load_json(self):
-        path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        path = self._ask_path(filedialog.askopenfilename, filetypes=[("JSON files", "*.json")])
         if not path: return
-        try:
-            
-            self.db = SchoolDBSqlite.load_json(path, getattr(self.db, "db_path", "school.db"))
-            self.refresh_all()
+
+        # parsing and validation run on the worker; the inserts need the db's own thread
+        def on_done(rows):
+            self.db.import_rows(rows)
+            self._schedule_refresh()
             messagebox.showinfo("Loaded", f"Loaded JSON into database:\n{self.db.db_path}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._run_io(SchoolDBSqlite.read_json, path, on_done=on_done)
 
     def on_save_json(self):
-        path = filedialog.asksaveasfilename(defaultextension=".json",
-                                            filetypes=[("JSON files", "*.json")])
+        path = self._ask_path(filedialog.asksaveasfilename, defaultextension=".json",
+                              filetypes=[("JSON files", "*.json")])
         if not path: return
         try:
-            self.db.save_json(path)
-            messagebox.showinfo("Saved", f"Saved JSON:\n{path}")
+            data = self.db.to_dict()
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+        self._run_io(SchoolDBSqlite.write_json, data, path,
+                     on_done=lambda _: messagebox.showinfo("Saved", f"Saved JSON:\n{path}"))
 
     
     def _make_tabs(self):
@@ -85,44 +252,66 @@ class SchoolApp(tk.Tk):
         nb.add(self.tab_enroll, text="Registration & Assignment")
         nb.add(self.tab_view, text="View / Search")
 
-        self._build_add_tab()
-        self._build_enroll_tab()
-        self._build_view_tab()
+        # tabs are filled in the first time they are shown, see _ensure_tab
+        self.nb = nb
+        # shown under the tabs while a long job (backup) reports progress, see _run_io
+        self._progress_bar = ttk.Progressbar(self, mode="determinate", maximum=100)
+        self._tab_names = {str(self.tab_add): "add", str(self.tab_enroll): "enroll", str(self.tab_view): "view"}
+        self._tabs_built = {"add": False, "enroll": False, "view": False}
+        nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._ensure_tab(self._tab_names[nb.select()])
+
+    def _on_tab_changed(self, _event):
+        if self._ensure_tab(self._tab_names[self.nb.select()]):
+            self._schedule_refresh()
+
+    def _ensure_tab(self, name):
+        """Build tab ``name`` if it has not been built yet; returns True if it was."""
+        if self._tabs_built[name]:
+            return False
+        {"add": self._build_add_tab, "enroll": self._build_enroll_tab, "view": self._build_view_tab}[name]()
+        self._tabs_built[name] = True
+        # the new tab's pickers start empty, so refill every kind on the next refresh
+        self._combo_cache = dict.fromkeys(self._combo_cache)
+        return True
 
 
     def _build_add_tab(self):
         
         fs = ttk.LabelFrame(self.tab_add, text="Add Student")
         fs.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        self.st_name = ttk.Entry(fs); self._labeled(fs, "Name", 0, self.st_name)
-        self.st_age  = ttk.Entry(fs); self._labeled(fs, "Age", 1, self.st_age)
-        self.st_email= ttk.Entry(fs); self._labeled(fs, "Email", 2, self.st_email)
-        self.st_id   = ttk.Entry(fs); self._labeled(fs, "Student ID", 3, self.st_id)
+        self.st_name, self.st_age, self.st_email, self.st_id = self._rows(fs, [
+            ("Name", ttk.Entry(fs)), ("Age", ttk.Entry(fs)),
+            ("Email", ttk.Entry(fs)), ("Student ID", ttk.Entry(fs))])
         ttk.Button(fs, text="Add Student", command=self.add_student).grid(row=4, column=1, sticky="e", pady=5)
 
         
         fi = ttk.LabelFrame(self.tab_add, text="Add Instructor")
         fi.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
-        self.ins_name = ttk.Entry(fi); self._labeled(fi, "Name", 0, self.ins_name)
-        self.ins_age  = ttk.Entry(fi); self._labeled(fi, "Age", 1, self.ins_age)
-        self.ins_email= ttk.Entry(fi); self._labeled(fi, "Email", 2, self.ins_email)
-        self.ins_id   = ttk.Entry(fi); self._labeled(fi, "Instructor ID", 3, self.ins_id)
+        self.ins_name, self.ins_age, self.ins_email, self.ins_id = self._rows(fi, [
+            ("Name", ttk.Entry(fi)), ("Age", ttk.Entry(fi)),
+            ("Email", ttk.Entry(fi)), ("Instructor ID", ttk.Entry(fi))])
         ttk.Button(fi, text="Add Instructor", command=self.add_instructor).grid(row=4, column=1, sticky="e", pady=5)
 
         
         fc = ttk.LabelFrame(self.tab_add, text="Add Course")
         fc.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=10)
-        self.c_id   = ttk.Entry(fc); self._labeled(fc, "Course ID", 0, self.c_id)
-        self.c_name = ttk.Entry(fc); self._labeled(fc, "Course Name", 1, self.c_name)
-        self.c_instr= ttk.Combobox(fc, state="readonly"); self._labeled(fc, "Instructor", 2, self.c_instr)
+        self.c_id, self.c_name, self.c_instr = self._rows(fc, [
+            ("Course ID", ttk.Entry(fc)), ("Course Name", ttk.Entry(fc)),
+            ("Instructor", AutocompleteEntry(fc))])
         ttk.Button(fc, text="Add Course", command=self.add_course).grid(row=3, column=1, sticky="e", pady=5)
 
         self.tab_add.columnconfigure((0,1), weight=1)
 
-    def _labeled(self, parent, text, row, widget):
-        ttk.Label(parent, text=text).grid(row=row, column=0, sticky="w", padx=4, pady=4)
-        widget.grid(row=row, column=1, sticky="ew", padx=4, pady=4)
-        parent.columnconfigure(1, weight=1)
+    @staticmethod
+    def _rows(parent, specs, label_grid=_LABEL_GRID, field_grid=_FIELD_GRID, stretch=True):
+        """Grid ``(label text, widget)`` pairs as form rows of ``parent``; returns the widgets."""
+        for row, (text, widget) in enumerate(specs):
+            ttk.Label(parent, text=text).grid(row=row, **label_grid)
+            widget.grid(row=row, **field_grid)
+        if stretch:
+            parent.columnconfigure(1, weight=1)
+        return [widget for _, widget in specs]
 
     def add_student(self):
         try:
@@ -134,7 +323,7 @@ class SchoolApp(tk.Tk):
             messagebox.showinfo("OK", "Student added.")
             self.st_name.delete(0, tk.END); self.st_age.delete(0, tk.END)
             self.st_email.delete(0, tk.END); self.st_id.delete(0, tk.END)
-            self.refresh_all()
+            self._schedule_refresh()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -148,19 +337,21 @@ class SchoolApp(tk.Tk):
             messagebox.showinfo("OK", "Instructor added.")
             self.ins_name.delete(0, tk.END); self.ins_age.delete(0, tk.END)
             self.ins_email.delete(0, tk.END); self.ins_id.delete(0, tk.END)
-            self.refresh_all()
+            self._schedule_refresh()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
     def add_course(self):
         try:
-            instr_id = self.c_instr.get().split(" | ")[0] if self.c_instr.get() else None
-            instr = self.db.instructors.get(instr_id) if instr_id else None
+            instr_id = self._combo_id(self.c_instr)
+            if instr_id is None and self.c_instr.get().strip():
+                raise ValueError("Pick the instructor from the suggestions.")
+            instr = self.db.get_instructor(instr_id)
             c = Course(self.c_id.get().strip(), self.c_name.get().strip(), instr)
             self.db.add_course(c)
             messagebox.showinfo("OK", "Course added.")
             self.c_id.delete(0, tk.END); self.c_name.delete(0, tk.END); self.c_instr.set("")
-            self.refresh_all()
+            self._schedule_refresh()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -168,41 +359,41 @@ class SchoolApp(tk.Tk):
     def _build_enroll_tab(self):
         fr = ttk.LabelFrame(self.tab_enroll, text="Student Registration")
         fr.pack(fill="x", padx=10, pady=10)
-        self.reg_student = ttk.Combobox(fr, state="readonly", width=40)
-        self.reg_course  = ttk.Combobox(fr, state="readonly", width=40)
-        ttk.Label(fr, text="Student").grid(row=0, column=0, padx=5, pady=4, sticky="w")
-        self.reg_student.grid(row=0, column=1, padx=5, pady=4)
-        ttk.Label(fr, text="Course").grid(row=1, column=0, padx=5, pady=4, sticky="w")
-        self.reg_course.grid(row=1, column=1, padx=5, pady=4)
+        self.reg_student, self.reg_course = self._rows(fr, [
+            ("Student", AutocompleteEntry(fr, width=40)),
+            ("Course", AutocompleteEntry(fr, width=40))],
+            _PICK_LABEL_GRID, _PICK_FIELD_GRID, stretch=False)
         ttk.Button(fr, text="Register", command=self.register_student).grid(row=0, column=2, rowspan=2, padx=8)
 
         fa = ttk.LabelFrame(self.tab_enroll, text="Instructor Assignment")
         fa.pack(fill="x", padx=10, pady=10)
-        self.ass_course = ttk.Combobox(fa, state="readonly", width=40)
-        self.ass_instr  = ttk.Combobox(fa, state="readonly", width=40)
-        ttk.Label(fa, text="Course").grid(row=0, column=0, padx=5, pady=4, sticky="w")
-        self.ass_course.grid(row=0, column=1, padx=5, pady=4)
-        ttk.Label(fa, text="Instructor").grid(row=1, column=0, padx=5, pady=4, sticky="w")
-        self.ass_instr.grid(row=1, column=1, padx=5, pady=4)
+        self.ass_course, self.ass_instr = self._rows(fa, [
+            ("Course", AutocompleteEntry(fa, width=40)),
+            ("Instructor", AutocompleteEntry(fa, width=40))],
+            _PICK_LABEL_GRID, _PICK_FIELD_GRID, stretch=False)
         ttk.Button(fa, text="Assign", command=self.assign_instructor).grid(row=0, column=2, rowspan=2, padx=8)
 
     def register_student(self):
         try:
-            sid = self.reg_student.get().split(" | ")[0]
-            cid = self.reg_course.get().split(" | ")[0]
+            sid = self._combo_id(self.reg_student)
+            cid = self._combo_id(self.reg_course)
+            if sid is None or cid is None:
+                raise ValueError("Select a student and a course.")
             self.db.register_student_in_course(sid, cid)
             messagebox.showinfo("OK", "Student registered to course.")
-            self.refresh_all()
+            self._schedule_refresh()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
     def assign_instructor(self):
         try:
-            cid = self.ass_course.get().split(" | ")[0]
-            iid = self.ass_instr.get().split(" | ")[0]
+            cid = self._combo_id(self.ass_course)
+            iid = self._combo_id(self.ass_instr)
+            if cid is None or iid is None:
+                raise ValueError("Select a course and an instructor.")
             self.db.assign_instructor_to_course(iid, cid)
             messagebox.showinfo("OK", "Instructor assigned to course.")
-            self.refresh_all()
+            self._schedule_refresh()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -211,17 +402,27 @@ class SchoolApp(tk.Tk):
         top = ttk.Frame(self.tab_view); top.pack(fill="x", padx=10, pady=6)
         ttk.Label(top, text="Search").pack(side="left", padx=4)
         self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self._on_search_typed)
         ent = ttk.Entry(top, textvariable=self.search_var, width=40)
         ent.pack(side="left", padx=4)
         ttk.Button(top, text="Go", command=self.on_search).pack(side="left", padx=4)
         ttk.Button(top, text="Clear", command=self.on_clear).pack(side="left", padx=4)
 
         cols = ("Type", "ID", "Name", "Extra")
-        self.tree = ttk.Treeview(self.tab_view, columns=cols, show="headings", height=18)
+        body = ttk.Frame(self.tab_view); body.pack(fill="both", expand=True, padx=10, pady=8)
+        ttk.Style(self).configure("Treeview", rowheight=ROW_HEIGHT)
+        self.tree = ttk.Treeview(body, columns=cols, show="headings", height=self._page)
         for c in cols:
             self.tree.heading(c, text=c)
             self.tree.column(c, width=210 if c == "Extra" else 160, anchor="w")
-        self.tree.pack(fill="both", expand=True, padx=10, pady=8)
+        # the scrollbar drives our own window over _row_order, not the Treeview
+        self.tree_scroll = ttk.Scrollbar(body, orient="vertical", command=self._on_tree_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree_scroll.pack(side="right", fill="y")
+        self.tree.bind("<Configure>", self._on_tree_resize)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(seq, self._on_tree_wheel)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
 
        
         btns = ttk.Frame(self.tab_view)
@@ -229,50 +430,186 @@ class SchoolApp(tk.Tk):
         ttk.Button(btns, text="Edit Selected", command=self.edit_selected).pack(side="left", padx=4)
         ttk.Button(btns, text="Delete Selected", command=self.delete_selected).pack(side="left", padx=4)
 
+    def _on_search_typed(self, *_):
+        # search as the user types, but only once typing pauses for 150 ms
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(150, self.on_search)
+
     def on_search(self):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
         query = self.search_var.get().strip()
         res = self.db.search(query)
-        self._fill_tree(res)
+        self._top = 0
+        self._fill_tree(res["students"], res["instructors"], res["courses"])
 
     def on_clear(self):
         self.search_var.set("")
         self.refresh_tree()
 
+    def _schedule_refresh(self):
+        """Refresh once the event queue is idle; several writes in a row share one refresh."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_pending = False
+        self.refresh_all()
+
     def refresh_all(self):
-        self.db.refresh_cache()  
-        self.c_instr["values"] = [f"{i.instructor_id} | {i.name}" for i in self.db.instructors.values()]
-        self.reg_student["values"] = [f"{s.student_id} | {s.name}" for s in self.db.students.values()]
-        self.reg_course["values"]  = [f"{c.course_id} | {c.course_name}" for c in self.db.courses.values()]
-        self.ass_course["values"]  = self.reg_course["values"]
-        self.ass_instr["values"]   = self.c_instr["values"]
-        self.refresh_tree()
+        self._refresh_combos()
+        if self._tabs_built["view"]:
+            self.refresh_tree()
+
+    def _refresh_combos(self):
+        # the db keeps its cache current on every write; only rebuild the
+        # picker lists whose collection changed since they were last filled
+        combos = self._built_combos()
+        for kind, items in (("instructors", self.db.instructors), ("students", self.db.students),
+                            ("courses", self.db.courses)):
+            if combos[kind] and self._combo_stale(kind):
+                # one list per kind, shared by every picker that shows it
+                ids = list(items)
+                values = list(map(_combo_label, items.values()))
+                for cb in combos[kind]:
+                    cb.set_choices(values, ids)
+
+    def _built_combos(self):
+        """Record pickers (``AutocompleteEntry``) per kind, limited to the tabs built so far."""
+        combos = {"students": [], "instructors": [], "courses": []}
+        if self._tabs_built["add"]:
+            combos["instructors"].append(self.c_instr)
+        if self._tabs_built["enroll"]:
+            combos["instructors"].append(self.ass_instr)
+            combos["students"].append(self.reg_student)
+            combos["courses"] += [self.reg_course, self.ass_course]
+        return combos
+
+    @staticmethod
+    def _combo_id(cb):
+        """Id of the picked entry, or None when the text is not one of the choices."""
+        return cb.current_id()
+
+    def _combo_stale(self, kind):
+        version = self.db.versions[kind]
+        if self._combo_cache[kind] == version:
+            return False
+        self._combo_cache[kind] = version
+        return True
 
     def refresh_tree(self):
-        res = {"students": list(self.db.students.values()),
-               "instructors": list(self.db.instructors.values()),
-               "courses": list(self.db.courses.values())}
-        self._fill_tree(res)
+        self._fill_tree(self.db.students.values(), self.db.instructors.values(), self.db.courses.values())
+
+    @staticmethod
+    def _tree_row(obj):
+        """``(iid, values)`` of one record. The "extra" string is cached on the model
+        (``_extra_cache``) and only rebuilt after the db layer clears it."""
+        extra = obj._extra_cache
+        if isinstance(obj, Student):
+            if extra is None:
+                extra = obj._extra_cache = ", ".join([c.course_id for c in obj.registered_courses]) or "-"
+            return f"S:{obj.student_id}", ("Student", obj.student_id, obj.name, extra)
+        if isinstance(obj, Instructor):
+            if extra is None:
+                extra = obj._extra_cache = ", ".join([c.course_id for c in obj.assigned_courses]) or "-"
+            return f"I:{obj.instructor_id}", ("Instructor", obj.instructor_id, obj.name, extra)
+        if extra is None:
+            extra = obj._extra_cache = \
+                f"Instr: {obj.instructor.name if obj.instructor else '—'}, Enrolled: {len(obj.enrolled_students)}"
+        return f"C:{obj.course_id}", ("Course", obj.course_id, obj.course_name, extra)
+
+    def _fill_tree(self, students, instructors, courses):
+        """Show the given records (any iterables, e.g. dict views) in the tree."""
+        rows = dict(map(self._tree_row, chain(students, instructors, courses)))
+        self._tree_rows = rows
+        self._row_order = list(rows)
+        self._show_window()
+
+    def _show_window(self):
+        """Bring the Treeview in line with the ``_page`` rows starting at ``_top``.
+        Only rows entering, leaving or changing inside that window touch Tk, so the
+        cost of a refresh or a scroll step does not grow with the number of records."""
+        total = len(self._row_order)
+        self._top = max(0, min(self._top, total - self._page))
+        window = {iid: self._tree_rows[iid] for iid in self._row_order[self._top:self._top + self._page]}
+        shown = self._shown
+        gone = [iid for iid in shown if iid not in window]
+        if gone:
+            self.tree.delete(*gone)
+        _insert, _item, _get = self.tree.insert, self.tree.item, shown.get
+        for pos, (iid, values) in enumerate(window.items()):
+            prev = _get(iid)
+            if prev is None:
+                _insert("", pos, iid=iid, values=values)
+            elif prev != values:
+                _item(iid, values=values)
+        order = list(window)
+        if list(self.tree.get_children()) != order:
+            for pos, iid in enumerate(order):
+                self.tree.move(iid, "", pos)
+        self._shown = window
+        if self._selected in window and self._selected not in self.tree.selection():
+            self.tree.selection_set(self._selected)
+        if total:
+            self.tree_scroll.set(self._top / total, (self._top + len(window)) / total)
+        else:
+            self.tree_scroll.set(0, 1)
 
-    def _fill_tree(self, res):
-        self.tree.delete(*self.tree.get_children())
-        
-        for s in res["students"]:
-            extra = ", ".join([c.course_id for c in s.registered_courses]) or "-"
-            self.tree.insert("", "end", values=("Student", s.student_id, s.name, extra))
-        
-        for i in res["instructors"]:
-            extra = ", ".join([c.course_id for c in i.assigned_courses]) or "-"
-            self.tree.insert("", "end", values=("Instructor", i.instructor_id, i.name, extra))
-        
-        for c in res["courses"]:
-            extra = f"Instr: {c.instructor.name if c.instructor else '—'}, Enrolled: {len(c.enrolled_students)}"
-            self.tree.insert("", "end", values=("Course", c.course_id, c.course_name, extra))
+    def _on_tree_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self._top = int(float(amount) * len(self._row_order))
+        else:
+            self._top += int(amount) * (self._page if unit == "pages" else 1)
+        self._show_window()
+
+    def _on_tree_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self._top += -3 if up else 3
+        self._show_window()
+        return "break"
+
+    def _on_tree_resize(self, event):
+        # the first row starts below the headings; before any row exists assume one row
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else None
+        head = bbox[1] if bbox else ROW_HEIGHT
+        page = max(1, (event.height - head) // ROW_HEIGHT)
+        if page != self._page:
+            self._page = page
+            self._show_window()
+
+    def _on_tree_select(self, _event):
+        # rows scrolled out of the window leave the Treeview, so remember the pick here
+        sel = self.tree.selection()
+        if sel:
+            self._selected = sel[0]
+
+    def _redraw_rows(self, old_iid, obj, related=()):
+        """Redraw the edited record ``obj`` (shown as ``old_iid``) and the rows in
+        ``related`` whose text mentions it, without rebuilding the rest of the view."""
+        iid, values = self._tree_row(obj)
+        if old_iid in self._tree_rows:
+            if iid != old_iid:
+                # keep the renamed record in its old place
+                del self._tree_rows[old_iid]
+                self._row_order[self._row_order.index(old_iid)] = iid
+                if self._selected == old_iid:
+                    self._selected = iid
+            self._tree_rows[iid] = values
+        for other in related:
+            riid, rvalues = self._tree_row(other)
+            if riid in self._tree_rows:
+                self._tree_rows[riid] = rvalues
+        self._show_window()
 
     def _get_selected_record(self):
-        sel = self.tree.selection()
-        if not sel:
+        row = self._tree_rows.get(self._selected)
+        if not row:
             return None, None
-        row = self.tree.item(sel[0])["values"]
+        # read from our own copy: Tk would hand numeric-looking ids back as ints
         return row[0], row[1]
 
     def edit_selected(self):
@@ -292,17 +629,20 @@ class SchoolApp(tk.Tk):
             instr_val = obj.instructor.instructor_id if obj.instructor else ""
             fields = [("Course ID", obj.course_id), ("Course Name", obj.course_name), ("Instructor ID", instr_val)]
 
-        win = tk.Toplevel(self); win.title(f"Edit {r_type}")
+        win = self._edit_window(); win.title(f"Edit {r_type}")
         entries = {}
-        for i, (label, value) in enumerate(fields):
-            ttk.Label(win, text=label).grid(row=i, column=0, padx=6, pady=4, sticky="w")
-            e = ttk.Entry(win); e.insert(0, value)
-            e.grid(row=i, column=1, padx=6, pady=4, sticky="ew")
+        for (lbl, e), field in zip_longest(self._edit_rows, fields):
+            if field is None:
+                lbl.grid_remove(); e.grid_remove()
+                continue
+            label, value = field
+            lbl.configure(text=label); lbl.grid(); e.grid()
+            e.delete(0, tk.END); e.insert(0, value)
             entries[label] = e
-        win.columnconfigure(1, weight=1)
 
         def on_save():
             try:
+                related = ()
                 if r_type == "Student":
                     new = Student(entries["Name"].get().strip(),
                                   int(entries["Age"].get().strip()),
@@ -315,20 +655,45 @@ class SchoolApp(tk.Tk):
                                      entries["Email"].get().strip(),
                                      entries["Instructor ID"].get().strip())
                     self.db.update_instructor(r_id, new)
+                    # course rows show the instructor's name
+                    related = list(obj.assigned_courses)
                 else:
                     iid = entries["Instructor ID"].get().strip()
-                    instr = self.db.instructors.get(iid) if iid else None
+                    instr = self.db.get_instructor(iid)
                     new = Course(entries["Course ID"].get().strip(),
                                  entries["Course Name"].get().strip(),
                                  instr)
+                    # student and instructor rows list this course's id
+                    related = [*obj.enrolled_students, *filter(None, (obj.instructor, instr))]
                     self.db.update_course(r_id, new)
 
-                self.refresh_all()
-                win.destroy()
+                # only the edited row (and rows that mention it) can have changed
+                self._refresh_combos()
+                self._redraw_rows(f"{r_type[0]}:{r_id}", obj, related)
+                win.withdraw()
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
-        ttk.Button(win, text="Save", command=on_save).grid(row=len(fields), column=1, sticky="e", padx=6, pady=8)
+        self._save_btn.configure(command=on_save)
+        win.deiconify(); win.lift()
+
+    def _edit_window(self):
+        """The edit dialog. It is built on first use and only hidden afterwards, so later
+        edits just relabel and refill its rows instead of creating new widgets."""
+        if self._edit_win is None:
+            win = tk.Toplevel(self)
+            win.protocol("WM_DELETE_WINDOW", win.withdraw)
+            self._edit_rows = []
+            for i in range(4):  # the most fields any record type has
+                lbl, e = ttk.Label(win), ttk.Entry(win)
+                lbl.grid(row=i, column=0, padx=6, pady=4, sticky="w")
+                e.grid(row=i, column=1, padx=6, pady=4, sticky="ew")
+                self._edit_rows.append((lbl, e))
+            win.columnconfigure(1, weight=1)
+            self._save_btn = ttk.Button(win, text="Save")
+            self._save_btn.grid(row=4, column=1, sticky="e", padx=6, pady=8)
+            self._edit_win = win
+        return self._edit_win
 
     def delete_selected(self):
         r_type, r_id = self._get_selected_record()
@@ -344,7 +709,7 @@ class SchoolApp(tk.Tk):
                 self.db.delete_instructor(r_id)
             else:
                 self.db.delete_course(r_id)
-            self.refresh_all()
+            self._schedule_refresh()
             messagebox.showinfo("Deleted", f"{r_type} deleted.")
         except Exception as e:
             messagebox.showerror("Error", str(e))
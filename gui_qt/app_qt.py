@@ -1,24 +1,80 @@
 from __future__ import annotations
-from typing import List
-import re, csv
+from typing import Iterable, Iterator, List
+import os, csv
+from itertools import islice
+from operator import attrgetter
 from PyQt5 import QtWidgets, QtCore
 from data.db_sqlite import SchoolDBSqlite
 from models.student import Student
 from models.instructor import Instructor
 from models.course import Course
+from models.validators import validate_email
 
 
-EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+# table model: below this many rows a diff is always cheaper than a reset
+RESET_MIN_ROWS = 200
 
-def validate_email(s: str):
-    """Validate email format using a regular expression.
-    :param s: Email string to validate
-    :type s: str
-    :raises ValueError: if email format is invalid
-    :return: None
-    """
-    if not EMAIL_RE.match(s or ""):
-        raise ValueError("Invalid email format.")
+# delay after the last keystroke before the view tab searches
+SEARCH_DELAY_MS = 150
+
+# CSV export: rows handed to writerows at a time, and the file buffer size
+CSV_CHUNK_ROWS = 4096
+CSV_BUFFER_BYTES = 1 << 23
+
+_combo_label = attrgetter("_combo_label")
+
+
+def _chunked(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    """Yield lists of at most ``size`` rows from ``rows``.
+    :param rows: Any iterable of rows
+    :param size: Maximum rows per chunk"""
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _student_extra(s: Student) -> str:
+    """Registered course ids of a student, as shown in the table.
+    Cached on the model (``_extra_cache``) until a registration change clears it.
+    :param s: Student to describe"""
+    extra = s._extra_cache
+    if extra is None:
+        extra = s._extra_cache = ", ".join([c.course_id for c in s.registered_courses]) or "-"
+    return extra
+
+def _instructor_extra(i: Instructor) -> str:
+    """Assigned course ids of an instructor, as shown in the table.
+    Cached on the model (``_extra_cache``) until an assignment change clears it.
+    :param i: Instructor to describe"""
+    extra = i._extra_cache
+    if extra is None:
+        extra = i._extra_cache = ", ".join([c.course_id for c in i.assigned_courses]) or "-"
+    return extra
+
+def _course_extra(c: Course) -> str:
+    """Instructor name and enrolment count of a course, as shown in the table.
+    Cached on the model (``_extra_cache``) until the db layer clears it.
+    :param c: Course to describe"""
+    extra = c._extra_cache
+    if extra is None:
+        extra = c._extra_cache = \
+            f"Instr: {c.instructor.name if c.instructor else '—'}, Enrolled: {len(c.enrolled_students)}"
+    return extra
+
+def _table_rows(students, instructors, courses) -> Iterator[tuple]:
+    """Yield the (type, id, name, extra) row of each record, in one pass.
+    Shared by the view table and the CSV export.
+    :param students: Iterable of students
+    :param instructors: Iterable of instructors
+    :param courses: Iterable of courses"""
+    for s in students:
+        yield ("Student", s.student_id, s.name, _student_extra(s))
+    for i in instructors:
+        yield ("Instructor", i.instructor_id, i.name, _instructor_extra(i))
+    for c in courses:
+        yield ("Course", c.course_id, c.course_name, _course_extra(c))
 
 def validate_nonneg_int(s: str, field_name: str = "Age") -> int:
     """Validate that the input string represents a non-negative integer.
@@ -34,6 +90,186 @@ def validate_nonneg_int(s: str, field_name: str = "Age") -> int:
     return v
 
 
+class SchoolTableModel(QtCore.QAbstractTableModel):
+    """Read-only table model over (type, id, name, extra) rows.
+
+    ``apply_delta`` diffs against the rows currently shown, keyed by (type, id),
+    so a single add/edit/delete only touches the affected rows in the view.
+    """
+    HEADERS = ("Type", "ID", "Name", "Extra")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[tuple] = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, idx, role=QtCore.Qt.DisplayRole):
+        # every cell is already a str (see _table_rows), so it is handed to Qt as is
+        if role == QtCore.Qt.DisplayRole and idx.isValid():
+            return self._rows[idx.row()][idx.column()]
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, idx):
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    def row(self, r: int) -> tuple:
+        """Return the row tuple shown at position ``r``."""
+        return self._rows[r]
+
+    def setRows(self, rows: List[tuple]):
+        """Replace the shown rows, emitting signals only for the difference.
+        :param rows: New list of (type, id, name, extra) tuples
+        :return: None"""
+        self.apply_delta(rows)
+
+    def apply_delta(self, rows: List[tuple]):
+        """Bring the model in line with ``rows``.
+
+        Removed keys are dropped and new keys inserted in contiguous runs, then
+        runs of changed rows get one dataChanged each. If the surviving rows
+        changed order, or most rows come or go (a new search), the model is
+        simply reset: one signal instead of thousands.
+        :param rows: New list of (type, id, name, extra) tuples
+        :return: None"""
+        rows = list(rows)
+        new_keys = {row[:2]: n for n, row in enumerate(rows)}
+        if len(new_keys) != len(rows):
+            # duplicate keys cannot be diffed by key
+            self._reset(rows)
+            return
+
+        gone = [n for n, row in enumerate(self._rows) if row[:2] not in new_keys]
+        if 2 * len(gone) > len(self._rows) > RESET_MIN_ROWS:
+            self._reset(rows)
+            return
+
+        # removals, back to front so earlier positions stay valid
+        for first, last in reversed(_runs(gone)):
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+
+        kept = [new_keys[row[:2]] for row in self._rows]
+        if kept != sorted(kept):
+            self._reset(rows)
+            return
+
+        # insertions, front to back: positions in ``rows`` are final positions
+        old_keys = {row[:2] for row in self._rows}
+        added = [n for n, row in enumerate(rows) if row[:2] not in old_keys]
+        if 2 * len(added) > len(rows) > RESET_MIN_ROWS:
+            self._reset(rows)
+            return
+        for first, last in _runs(added):
+            self.beginInsertRows(QtCore.QModelIndex(), first, last)
+            self._rows[first:first] = rows[first:last + 1]
+            self.endInsertRows()
+
+        last_col = len(self.HEADERS) - 1
+        changed = [n for n, row in enumerate(rows) if self._rows[n] != row]
+        self._rows[:] = rows
+        for first, last in _runs(changed):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_col))
+
+    def _reset(self, rows: List[tuple]):
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+
+def _runs(positions: List[int]) -> List[tuple]:
+    """Group sorted positions into (first, last) runs of consecutive values."""
+    out = []
+    for n in positions:
+        if out and out[-1][1] == n - 1:
+            out[-1] = (out[-1][0], n)
+        else:
+            out.append((n, n))
+    return out
+
+
+class TaskSignals(QtCore.QObject):
+    """Signals of a pool task (``CsvExportTask``, ``BackupTask``); delivered on the GUI thread (queued)."""
+    progress = QtCore.pyqtSignal(int, int)
+    done = QtCore.pyqtSignal(str)
+    error = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+
+
+class CsvExportTask(QtCore.QRunnable):
+    """Write a snapshot of table rows to a CSV file on a ``QThreadPool`` worker.
+
+    The rows are built on the GUI thread before the task starts, so the worker
+    never reads the db cache while the window may be changing it.
+    """
+
+    def __init__(self, path: str, rows: List[tuple]):
+        super().__init__()
+        self.path = path
+        self.rows = rows
+        self.signals = TaskSignals()
+        self._cancel = False
+
+    def cancel(self):
+        """Ask the task to stop after the chunk it is writing."""
+        self._cancel = True
+
+    def run(self):
+        total = len(self.rows)
+        written = 0
+        try:
+            # stream in chunks through a large buffer, reporting progress per chunk
+            with open(self.path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_BYTES) as f:
+                w = csv.writer(f)
+                w.writerow(["Type", "ID", "Name", "Extra"])
+                for chunk in _chunked(self.rows, CSV_CHUNK_ROWS):
+                    if self._cancel:
+                        break
+                    w.writerows(chunk)
+                    written += len(chunk)
+                    self.signals.progress.emit(written, total)
+            if self._cancel:
+                os.remove(self.path)
+                self.signals.cancelled.emit()
+            else:
+                self.signals.done.emit(self.path)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+
+class BackupTask(QtCore.QRunnable):
+    """Copy the database file with SQLite's online backup API on a ``QThreadPool`` worker.
+
+    Uses ``SchoolDBSqlite.backup_file``, which opens its own connection, so the
+    window's connection is never touched off the GUI thread.
+    """
+
+    def __init__(self, db_path: str, dest_path: str):
+        super().__init__()
+        self.db_path = db_path
+        self.dest_path = dest_path
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            SchoolDBSqlite.backup_file(
+                self.db_path, self.dest_path,
+                progress=lambda remaining, total: self.signals.progress.emit(total - remaining, total))
+            self.signals.done.emit(self.dest_path)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+
 class SchoolWindow(QtWidgets.QMainWindow):
     """Main window for the School Management System GUI using PyQt5
     :param db: Instance of SchoolDBSqlite for database operations
@@ -42,6 +278,15 @@ class SchoolWindow(QtWidgets.QMainWindow):
     def __init__(self, db: SchoolDBSqlite):
         super().__init__()
         self.db = db
+        # db.versions seen when each kind's combo boxes were last filled
+        self._combo_cache = {"students": None, "instructors": None, "courses": None}
+        # one string model per kind, shared by every combo box listing that kind,
+        # with the record ids kept parallel to its rows (see _combo_id)
+        self._combo_models = {kind: QtCore.QStringListModel(self) for kind in self._combo_cache}
+        self._combo_ids = {kind: [] for kind in self._combo_cache}
+        # running CsvExportTask, kept referenced until it reports back
+        self._export_task = None
+        self._backup_task = None
         self.setWindowTitle("School Management System")
         self.resize(1000, 640)
 
@@ -111,6 +356,7 @@ class SchoolWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
         self.db = SchoolDBSqlite(path)
+        self._combo_cache = dict.fromkeys(self._combo_cache)
         self.refresh_all()
         QtWidgets.QMessageBox.information(self, "Database", f"Connected to:\n{path}")
 
@@ -120,13 +366,34 @@ class SchoolWindow(QtWidgets.QMainWindow):
         :param path: Path to save the backup database file
         """
         path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Backup Database", "", "SQLite DB (*.db)")
-        if not path:
+        if not path or self._backup_task is not None:
             return
-        try:
-            self.db.backup_db(path)
-            QtWidgets.QMessageBox.information(self, "Backup", f"Database copied to:\n{path}")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+        # every write is already committed, so a private connection sees it all;
+        # the page copy runs on a pool thread and reports progress here
+        task = BackupTask(self.db.db_path, path)
+        task.setAutoDelete(False)
+        dlg = QtWidgets.QProgressDialog("Backing up database…", None, 0, 1, self)
+        dlg.setWindowTitle("Backup Database")
+        dlg.setMinimumDuration(300)
+
+        def on_progress(done, total):
+            dlg.setMaximum(max(total, 1))
+            dlg.setValue(done)
+        task.signals.progress.connect(on_progress)
+        task.signals.done.connect(
+            lambda p: QtWidgets.QMessageBox.information(self, "Backup", f"Database copied to:\n{p}"))
+        task.signals.error.connect(lambda msg: QtWidgets.QMessageBox.critical(self, "Error", msg))
+        for sig in (task.signals.done, task.signals.error):
+            sig.connect(lambda *_: self._backup_finished(dlg))
+        self._backup_task = task
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def _backup_finished(self, dlg):
+        """Close the progress dialog and allow the next backup.
+        :return: None"""
+        dlg.reset()
+        dlg.deleteLater()
+        self._backup_task = None
 
     def on_load(self):
         """Load data from a JSON file into the database.
@@ -135,7 +402,7 @@ class SchoolWindow(QtWidgets.QMainWindow):
         if not path:
             return
         try:
-            self.db = SchoolDBSqlite.load_json(path, getattr(self.db, "db_path", "school.db"))
+            self.db = SchoolDBSqlite.load_json(path, getattr(self.db, "db_path", "school.db"), into=self.db)
             self.refresh_all()
             QtWidgets.QMessageBox.information(self, "Loaded", f"Loaded JSON into DB:\n{self.db.db_path}")
         except Exception as e:
@@ -158,31 +425,36 @@ class SchoolWindow(QtWidgets.QMainWindow):
         """Export all records to a CSV file.
         :return: None"""
         path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export CSV", "", "CSV Files (*.csv)")
-        if not path:
+        if not path or self._export_task is not None:
             return
-        try:
-            rows = []
-            
-            for s in self.db.students.values():
-                extra = ", ".join(c.course_id for c in s.registered_courses) or "-"
-                rows.append(("Student", s.student_id, s.name, extra))
-            
-            for i in self.db.instructors.values():
-                extra = ", ".join(c.course_id for c in i.assigned_courses) or "-"
-                rows.append(("Instructor", i.instructor_id, i.name, extra))
-            
-            for c in self.db.courses.values():
-                extra = f"Instr: {c.instructor.name if c.instructor else '—'}, Enrolled: {len(c.enrolled_students)}"
-                rows.append(("Course", c.course_id, c.course_name, extra))
-
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f)
-                w.writerow(["Type", "ID", "Name", "Extra"])
-                w.writerows(rows)
+        # snapshot the rows here; the file is written on a pool thread so the
+        # window stays responsive (and cancellable) on large exports
+        task = CsvExportTask(path, list(self._all_rows()))
+        task.setAutoDelete(False)
+        dlg = QtWidgets.QProgressDialog("Exporting CSV…", "Cancel", 0, max(len(task.rows), 1), self)
+        dlg.setWindowTitle("Export CSV")
+        dlg.setMinimumDuration(300)
+        dlg.canceled.connect(task.cancel)
+        task.signals.progress.connect(lambda n, _total: dlg.setValue(n))
+        task.signals.done.connect(
+            lambda p: QtWidgets.QMessageBox.information(self, "Exported", f"CSV saved to: {p}"))
+        task.signals.error.connect(lambda msg: QtWidgets.QMessageBox.critical(self, "Error", msg))
+        for sig in (task.signals.done, task.signals.error, task.signals.cancelled):
+            sig.connect(lambda *_: self._export_finished(dlg))
+        self._export_task = task
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def _export_finished(self, dlg):
+        """Close the progress dialog and allow the next export.
+        :return: None"""
+        dlg.reset()
+        dlg.deleteLater()
+        self._export_task = None
 
-            QtWidgets.QMessageBox.information(self, "Exported", f"CSV saved to: {path}")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+    def _all_rows(self) -> Iterator[tuple]:
+        """Yield one row per record in the database, students first.
+        :return: Iterator of (type, id, name, extra) tuples"""
+        return _table_rows(self.db.students.values(), self.db.instructors.values(), self.db.courses.values())
 
     
     def _build_add_tab(self):
@@ -226,6 +498,7 @@ class SchoolWindow(QtWidgets.QMainWindow):
         self.c_id = QtWidgets.QLineEdit()
         self.c_name = QtWidgets.QLineEdit()
         self.c_instr = QtWidgets.QComboBox()
+        self.c_instr.setModel(self._combo_models["instructors"])
         c_btn = QtWidgets.QPushButton("Add Course")
         c_btn.clicked.connect(self.add_course)
         c_layout.addRow("Course ID", self.c_id)
@@ -259,7 +532,7 @@ class SchoolWindow(QtWidgets.QMainWindow):
             self.db.add_student(s)
             self.s_name.clear(); self.s_age.clear(); self.s_email.clear(); self.s_id.clear()
             QtWidgets.QMessageBox.information(self, "OK", "Student added.")
-            self.refresh_all()
+            self._refresh("students")
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
@@ -285,7 +558,7 @@ class SchoolWindow(QtWidgets.QMainWindow):
             self.db.add_instructor(ins)
             self.i_name.clear(); self.i_age.clear(); self.i_email.clear(); self.i_id.clear()
             QtWidgets.QMessageBox.information(self, "OK", "Instructor added.")
-            self.refresh_all()
+            self._refresh("instructors")
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
@@ -303,14 +576,13 @@ class SchoolWindow(QtWidgets.QMainWindow):
         None
          """
         try:
-            instr_text = self.c_instr.currentText()
-            instr_id = instr_text.split(" | ")[0] if instr_text else None
-            instr = self.db.instructors.get(instr_id) if instr_id else None
+            instr_id = self._combo_id(self.c_instr, "instructors")
+            instr = self.db.get_instructor(instr_id)
             c = Course(self.c_id.text().strip(), self.c_name.text().strip(), instr)
             self.db.add_course(c)
             self.c_id.clear(); self.c_name.clear(); self.c_instr.setCurrentIndex(-1)
             QtWidgets.QMessageBox.information(self, "OK", "Course added.")
-            self.refresh_all()
+            self._refresh("courses")
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
@@ -325,7 +597,9 @@ class SchoolWindow(QtWidgets.QMainWindow):
         gr = QtWidgets.QGroupBox("Student Registration")
         fr = QtWidgets.QGridLayout(gr)
         self.reg_student = QtWidgets.QComboBox()
+        self.reg_student.setModel(self._combo_models["students"])
         self.reg_course = QtWidgets.QComboBox()
+        self.reg_course.setModel(self._combo_models["courses"])
         breg = QtWidgets.QPushButton("Register")
         breg.clicked.connect(self.register_student)
         fr.addWidget(QtWidgets.QLabel("Student"), 0, 0)
@@ -339,7 +613,9 @@ class SchoolWindow(QtWidgets.QMainWindow):
         ga = QtWidgets.QGroupBox("Instructor Assignment")
         fa = QtWidgets.QGridLayout(ga)
         self.ass_course = QtWidgets.QComboBox()
+        self.ass_course.setModel(self._combo_models["courses"])
         self.ass_instr = QtWidgets.QComboBox()
+        self.ass_instr.setModel(self._combo_models["instructors"])
         bass = QtWidgets.QPushButton("Assign")
         bass.clicked.connect(self.assign_instructor)
         fa.addWidget(QtWidgets.QLabel("Course"), 0, 0)
@@ -356,11 +632,11 @@ class SchoolWindow(QtWidgets.QMainWindow):
         :returns: None
         """
         try:
-            sid = self.reg_student.currentText().split(" | ")[0]
-            cid = self.reg_course.currentText().split(" | ")[0]
+            sid = self._combo_id(self.reg_student, "students") or ""
+            cid = self._combo_id(self.reg_course, "courses") or ""
             self.db.register_student_in_course(sid, cid)
             QtWidgets.QMessageBox.information(self, "OK", "Student registered to course.")
-            self.refresh_all()
+            self._refresh()
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
@@ -370,11 +646,11 @@ class SchoolWindow(QtWidgets.QMainWindow):
         :returns: None
         """
         try:
-            cid = self.ass_course.currentText().split(" | ")[0]
-            iid = self.ass_instr.currentText().split(" | ")[0]
+            cid = self._combo_id(self.ass_course, "courses") or ""
+            iid = self._combo_id(self.ass_instr, "instructors") or ""
             self.db.assign_instructor_to_course(iid, cid)
             QtWidgets.QMessageBox.information(self, "OK", "Instructor assigned to course.")
-            self.refresh_all()
+            self._refresh()
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
@@ -397,8 +673,19 @@ class SchoolWindow(QtWidgets.QMainWindow):
         top.addWidget(go); top.addWidget(clr)
         v.addLayout(top)
 
-        self.table = QtWidgets.QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["Type", "ID", "Name", "Extra"])
+        # search as the user types, coalescing a burst of keystrokes into one search
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.on_search)
+        self.search_edit.textChanged.connect(lambda _=None: self._search_timer.start())
+        # Enter or leaving the field runs a pending search right away
+        self.search_edit.editingFinished.connect(self._flush_search)
+
+        self.table_model = SchoolTableModel(self)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.table_model)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         v.addWidget(self.table, 1)
 
@@ -416,96 +703,118 @@ class SchoolWindow(QtWidgets.QMainWindow):
     def on_search(self):
         """Perform a search based on the input text and update the table with results.
          :return: None"""
+        self._search_timer.stop()
         q = self.search_edit.text().strip()
         res = self.db.search(q)
         self._fill_table(res)
 
+    def _flush_search(self):
+        """Run the pending debounced search now, if there is one.
+        :return: None"""
+        if self._search_timer.isActive():
+            self._search_timer.stop()
+            self.on_search()
+
     def on_clear(self):
         """Clear the search input and refresh the table to show all records.
         :return: None"""
         self.search_edit.clear()
+        self._search_timer.stop()
         self.refresh_table()
 
    
     def refresh_all(self):
         """Refresh all UI components to reflect the current state of the database.
             :return: None"""
-        self.db.refresh_cache()
-       
-        self.c_instr.clear()
-        self.c_instr.addItems([f"{i.instructor_id} | {i.name}" for i in self.db.instructors.values()])
-        self.c_instr.setCurrentIndex(-1)
-
-        self.reg_student.clear()
-        self.reg_student.addItems([f"{s.student_id} | {s.name}" for s in self.db.students.values()])
-        self.reg_student.setCurrentIndex(-1)
-
-        self.reg_course.clear()
-        self.reg_course.addItems([f"{c.course_id} | {c.course_name}" for c in self.db.courses.values()])
-        self.reg_course.setCurrentIndex(-1)
-
-        self.ass_course.clear()
-        self.ass_course.addItems([f"{c.course_id} | {c.course_name}" for c in self.db.courses.values()])
-        self.ass_course.setCurrentIndex(-1)
+        self._refresh("students", "instructors", "courses")
 
-        self.ass_instr.clear()
-        self.ass_instr.addItems([f"{i.instructor_id} | {i.name}" for i in self.db.instructors.values()])
-        self.ass_instr.setCurrentIndex(-1)
+    def _refresh(self, *kinds: str):
+        """Refresh the combo boxes listing ``kinds`` and the table after a write.
+        Registration and assignment pass no kinds: they change no combo labels.
+        :param kinds: Collections whose rows were added, edited or deleted
+        :return: None"""
+        # the db keeps its cache current on every write; only refill the
+        # combo boxes whose collection changed since they were last filled
+        combos = {
+            "instructors": (self.c_instr, self.ass_instr),
+            "students": (self.reg_student,),
+            "courses": (self.reg_course, self.ass_course),
+        }
+        sources = {"instructors": self.db.instructors, "students": self.db.students,
+                   "courses": self.db.courses}
+        for kind in kinds:
+            items = sources[kind]
+            version = self.db.versions[kind]
+            if self._combo_cache[kind] == version:
+                continue
+            self._combo_cache[kind] = version
+            # one setStringList per kind updates every combo box sharing the model
+            for combo in combos[kind]:
+                combo.blockSignals(True)
+            self._combo_ids[kind] = list(items)
+            self._combo_models[kind].setStringList(list(map(_combo_label, items.values())))
+            for combo in combos[kind]:
+                combo.setCurrentIndex(-1)
+                combo.blockSignals(False)
 
         self.refresh_table()
 
+    def _combo_id(self, combo, kind: str):
+        """Id of the record picked in ``combo`` (which lists ``kind``), or None.
+        :return: Record ID or None"""
+        idx = combo.currentIndex()
+        return self._combo_ids[kind][idx] if idx >= 0 else None
+
     def refresh_table(self):
         """Refresh the table to show the current state of the database.
         :return: None
         """
-        res = {
-            "students": list(self.db.students.values()),
-            "instructors": list(self.db.instructors.values()),
-            "courses": list(self.db.courses.values()),
-        }
-        self._fill_table(res)
+        # the dict views are read once by _table_rows; no intermediate lists
+        self._fill_table({
+            "students": self.db.students.values(),
+            "instructors": self.db.instructors.values(),
+            "courses": self.db.courses.values(),
+        })
 
     def _fill_table(self, res):
         """Fill the table with data from the database.
-        :param res: The result set containing students, instructors, and courses.
+        :param res: The result set containing students, instructors, and courses (any iterables).
         :return: None
         """
-        rows: List[tuple] = []
-
-        for s in res["students"]:
-            extra = ", ".join(c.course_id for c in s.registered_courses) or "-"
-            rows.append(("Student", s.student_id, s.name, extra))
+        rows = list(_table_rows(res["students"], res["instructors"], res["courses"]))
 
-        for i in res["instructors"]:
-            extra = ", ".join(c.course_id for c in i.assigned_courses) or "-"
-            rows.append(("Instructor", i.instructor_id, i.name, extra))
-
-        for c in res["courses"]:
-            extra = f"Instr: {c.instructor.name if c.instructor else '—'}, Enrolled: {len(c.enrolled_students)}"
-            rows.append(("Course", c.course_id, c.course_name, extra))
-
-        self.table.setRowCount(len(rows))
-        for r, row in enumerate(rows):
-            for col, val in enumerate(row):
-                item = QtWidgets.QTableWidgetItem(str(val))
-                # make table read-only
-                item.setFlags(item.flags() ^ QtCore.Qt.ItemIsEditable)
-                self.table.setItem(r, col, item)
+        # the model only signals rows that were added, removed or changed;
+        # hold repaints until the whole delta is applied
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.table_model.apply_delta(rows)
+        finally:
+            self.table.setUpdatesEnabled(True)
 
    
     def _get_selected_record(self):
         """Get the type and ID of the currently selected record in the table.
         :return: Tuple of (record type, record ID) or (None, None) if no selection"""
-        row = self.table.currentRow()
+        row = self.table.currentIndex().row()
         if row < 0:
             return None, None
-        r_type = self.table.item(row, 0).text()
-        r_id   = self.table.item(row, 1).text()
+        r_type, r_id = self.table_model.row(row)[:2]
         return r_type, r_id
 
+    def _get_selected_records(self):
+        """Get the (type, ID) of every selected row in the table, top to bottom.
+        :return: List of (record type, record ID) tuples"""
+        rows = sorted(idx.row() for idx in self.table.selectionModel().selectedRows())
+        return [self.table_model.row(r)[:2] for r in rows]
+
     def edit_selected(self):
         """Edit the currently selected record in the table.
+        With several rows of one type selected, edits them together (see ``_edit_many``).
         :return: None """
+        records = self._get_selected_records()
+        if len(records) > 1:
+            self._edit_many(records)
+            return
         r_type, r_id = self._get_selected_record()
         if not r_type:
             QtWidgets.QMessageBox.warning(self, "Edit", "Select a row first.")
@@ -550,6 +859,7 @@ class SchoolWindow(QtWidgets.QMainWindow):
 
                 new = Student(new_name, new_age, new_email, new_id)
                 self.db.update_student(r_id, new)
+                kind = "students"
 
             elif r_type == "Instructor":
                 new_name  = edits["Name"].text().strip()
@@ -560,17 +870,78 @@ class SchoolWindow(QtWidgets.QMainWindow):
 
                 new = Instructor(new_name, new_age, new_email, new_id)
                 self.db.update_instructor(r_id, new)
+                kind = "instructors"
 
             else:  
                 new_cid   = edits["Course ID"].text().strip()
                 new_cname = edits["Course Name"].text().strip()
                 iid       = edits["Instructor ID"].text().strip()
-                instr     = self.db.instructors.get(iid) if iid else None
+                instr     = self.db.get_instructor(iid)
 
                 new = Course(new_cid, new_cname, instr)
                 self.db.update_course(r_id, new)
+                kind = "courses"
 
-            self.refresh_all()
+            self._refresh(kind)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+
+    def _edit_many(self, records):
+        """Apply the same field changes to several records of one type in one transaction.
+        Fields left blank keep each record's current value; IDs are not editable here.
+        :param records: List of (record type, record ID) tuples
+        :return: None"""
+        types = {r_type for r_type, _ in records}
+        if len(types) != 1:
+            QtWidgets.QMessageBox.warning(self, "Edit", "Select rows of a single type to edit them together.")
+            return
+        r_type = types.pop()
+        labels = ["Course Name", "Instructor ID"] if r_type == "Course" else ["Name", "Age", "Email"]
+
+        dlg = QtWidgets.QDialog(self)
+        dlg.setWindowTitle(f"Edit {len(records)} {r_type} records")
+        form = QtWidgets.QFormLayout(dlg)
+        form.addRow(QtWidgets.QLabel("Leave a field blank to keep each record's value."))
+        edits = {}
+        for label in labels:
+            edits[label] = QtWidgets.QLineEdit()
+            form.addRow(label, edits[label])
+        btns = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Save | QtWidgets.QDialogButtonBox.Cancel)
+        form.addRow(btns)
+        btns.accepted.connect(dlg.accept)
+        btns.rejected.connect(dlg.reject)
+        if dlg.exec_() != QtWidgets.QDialog.Accepted:
+            return
+
+        vals = {label: le.text().strip() for label, le in edits.items()}
+        try:
+            if r_type == "Course":
+                iid = vals["Instructor ID"]
+                if iid and iid not in self.db.instructors:
+                    raise ValueError(f"Unknown instructor: {iid}")
+                updates = []
+                for _, cid in records:
+                    c = self.db.courses[cid]
+                    instr = self.db.instructors[iid] if iid else c.instructor
+                    updates.append((cid, Course(cid, vals["Course Name"] or c.course_name, instr)))
+                self.db.update_courses_bulk(updates)
+                kind = "courses"
+            else:
+                age = validate_nonneg_int(vals["Age"], "Age") if vals["Age"] else None
+                if vals["Email"]:
+                    validate_email(vals["Email"])
+                source, cls, kind = ((self.db.students, Student, "students") if r_type == "Student"
+                                     else (self.db.instructors, Instructor, "instructors"))
+                updates = []
+                for _, rid in records:
+                    p = source[rid]
+                    updates.append((rid, cls(vals["Name"] or p.name, p.age if age is None else age,
+                                             vals["Email"] or p._email, rid)))
+                if r_type == "Student":
+                    self.db.update_students_bulk(updates)
+                else:
+                    self.db.update_instructors_bulk(updates)
+            self._refresh(kind)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
@@ -590,12 +961,15 @@ class SchoolWindow(QtWidgets.QMainWindow):
         try:
             if r_type == "Student":
                 self.db.delete_student(r_id)
+                kind = "students"
             elif r_type == "Instructor":
                 self.db.delete_instructor(r_id)
+                kind = "instructors"
             else:
                 self.db.delete_course(r_id)
+                kind = "courses"
 
-            self.refresh_all()
+            self._refresh(kind)
             QtWidgets.QMessageBox.information(self, "Deleted", f"{r_type} deleted.")
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
@@ -1,17 +1,23 @@
-from data.db_sqlite import SchoolDBSqlite
-from gui.app import SchoolApp
 import sys
-print("Choose UI: 1) Tkinter  2) PyQt")
-choice = input("Enter 1 or 2: ").strip()
+from data.db_sqlite import SchoolDBSqlite
+
+
+def main():
+    print("Choose UI: 1) Tkinter  2) PyQt")
+    choice = input("Enter 1 or 2: ").strip()
+
+    # import only the chosen toolkit, so the PyQt path never loads Tk (and vice versa)
+    if choice == "1":
+        from gui.app import SchoolApp
+        app = SchoolApp(SchoolDBSqlite("school.db"))
+        app.mainloop()
+    elif choice == "2":
+        import main_qt
+        main_qt.run()
+    else:
+        print("Invalid choice")
+        sys.exit(1)
+
 
-if choice == "1":
-    import tkinter  
-elif choice == "2":
-    import main_qt  
-else:
-    print("Invalid choice")
-    sys.exit(1)
 if __name__ == "__main__":
-    db = SchoolDBSqlite("school.db")  
-    app = SchoolApp(db)
-    app.mainloop()
+    main()
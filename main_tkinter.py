@@ -8,6 +8,7 @@ and back up the database.
 """
 
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox
 
 from data.db_sqlite import SchoolDBSqlite
@@ -16,6 +17,8 @@ from models.instructor import Instructor
 from models.course import Course
 
 DB_PATH = "school.sqlite"
+# fixed Treeview row height in pixels, so the rows on screen follow from the widget height
+ROW_HEIGHT = 20
 
 
 class SchoolGUI(tk.Tk):
@@ -40,14 +43,44 @@ class SchoolGUI(tk.Tk):
 
         # ---- data access ---------------------------------------------------
         self.db = SchoolDBSqlite(DB_PATH)
+        # view rows and one lowercased search string per row, re-read only after a write
+        self._rows_cache = None
+        self._rows_haystack = None
+        self._rows_dirty = True
+        # search text the table was last filled with (the entry may have changed since)
+        self._table_query = ""
+        # (row, haystack) pairs shown for _table_query; a longer query that contains
+        # it can only match a subset of them. None after the rows changed.
+        self._table_matches = None
+        # rows matching the search; the table only holds the _table_visible of them
+        # starting at _table_top, see _render_window
+        self._table_rows = []
+        self._table_top = 0
+        self._table_visible = 1
+        # pick lists are rebuilt only after a record is added, deleted or reloaded
+        self._picklists_dirty = True
+        # set while a refresh is queued on the Tk idle queue, see _schedule_refresh
+        self._refresh_scheduled = False
+        # Register / Assign clicks queued as id pairs and written in one batch each,
+        # see _flush_pending
+        self._pending_enrollments = []
+        self._pending_assignments = []
+        # file I/O (CSV export, backup) runs here so the Tk event loop keeps running
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
 
         # ---- top bar (save/load/export/backup) -----------------------------
         bar = ttk.Frame(self, padding=8)
         bar.pack(fill="x")
-        ttk.Button(bar, text="Save", command=self.save_db).pack(side="left")
-        ttk.Button(bar, text="Load", command=self.load_db).pack(side="left", padx=(8, 0))
-        ttk.Button(bar, text="Export CSV", command=self.export_csv).pack(side="left", padx=(8, 0))
-        ttk.Button(bar, text="Backup DB", command=self.backup_db).pack(side="left", padx=(8, 0))
+        self._bar_buttons = [
+            ttk.Button(bar, text="Save", command=self.save_db),
+            ttk.Button(bar, text="Load", command=self.load_db),
+            ttk.Button(bar, text="Export CSV", command=self.export_csv),
+            ttk.Button(bar, text="Backup DB", command=self.backup_db),
+        ]
+        for n, btn in enumerate(self._bar_buttons):
+            btn.pack(side="left", padx=(8 if n else 0, 0))
+        self._status = ttk.Label(bar, text="")
+        self._status.pack(side="left", padx=(12, 0))
 
         # ---- notebook with tabs -------------------------------------------
         self.tabs = ttk.Notebook(self)
@@ -80,8 +113,13 @@ class SchoolGUI(tk.Tk):
         """
         Commit all pending changes to the SQLite file.
 
+        The database runs in WAL mode with ``synchronous=NORMAL`` (see
+        ``data.db_sqlite.PRAGMAS``), so the commit is an append to the log and
+        does not wait on readers.
+
         :return: None
         """
+        self._flush_pending()
         try:
             self.db.conn.commit()
             messagebox.showinfo("Saved", "Changes were saved.")
@@ -97,15 +135,50 @@ class SchoolGUI(tk.Tk):
 
         :return: None
         """
+        self._flush_pending()
         try:
             self.db.close()
         except Exception:
             pass
         self.db = SchoolDBSqlite(DB_PATH)
+        self._rows_dirty = self._picklists_dirty = True
         self._refresh_picklists()
         self._refresh_table()
         messagebox.showinfo("Loaded", "Database connection re-opened.")
 
+    def _run_io(self, message, fn, *args, on_done):
+        """
+        Run ``fn(*args)`` on the I/O worker and pass its result to ``on_done``.
+
+        The worker never touches widgets: its result is picked up by polling
+        from the Tk thread (see :meth:`_check_future`). The top bar stays
+        disabled and shows ``message`` until the job finishes.
+
+        :return: None
+        """
+        for btn in self._bar_buttons:
+            btn.state(["disabled"])
+        self._status.configure(text=message)
+        fut = self._io_pool.submit(fn, *args)
+        self.after(50, self._check_future, fut, on_done)
+
+    def _check_future(self, fut, on_done):
+        """
+        Poll a job started by :meth:`_run_io`; report its result or error.
+
+        :return: None
+        """
+        if not fut.done():
+            self.after(50, self._check_future, fut, on_done)
+            return
+        for btn in self._bar_buttons:
+            btn.state(["!disabled"])
+        self._status.configure(text="")
+        try:
+            on_done(fut.result())
+        except Exception as err:
+            messagebox.showerror("Error", str(err))
+
     def export_csv(self):
         """
         Export all tables to CSV files.
@@ -117,26 +190,29 @@ class SchoolGUI(tk.Tk):
         * ``school_export_courses.csv``
         * ``school_export_enrollments.csv``
 
+        The files are written on the I/O worker through a separate connection.
+
         :return: None
         """
-        try:
-            created = self.db.export_csv("school_export")
+        def done(created):
             report = "\n".join(f"- {k}: {v}" for k, v in created.items())
             messagebox.showinfo("CSV Export", f"Files created:\n{report}")
-        except Exception as err:
-            messagebox.showerror("Error", str(err))
+
+        self._flush_pending()
+        self._run_io("Exporting…", SchoolDBSqlite.export_csv_file, self.db.db_path, "school_export",
+                     on_done=done)
 
     def backup_db(self):
         """
         Make a copy of the SQLite file as ``school_backup.sqlite``.
 
+        The pages are copied on the I/O worker through a separate connection.
+
         :return: None
         """
-        try:
-            self.db.backup_to("school_backup.sqlite")
-            messagebox.showinfo("Backup", "Backup file: school_backup.sqlite")
-        except Exception as err:
-            messagebox.showerror("Error", str(err))
+        self._flush_pending()
+        self._run_io("Backing up…", SchoolDBSqlite.backup_file, self.db.db_path, "school_backup.sqlite",
+                     on_done=lambda _: messagebox.showinfo("Backup", "Backup file: school_backup.sqlite"))
 
     # ------------------------------------------------------------------ #
     # Manage tab
@@ -284,11 +360,16 @@ class SchoolGUI(tk.Tk):
         cols = ("type", "id", "name", "age", "email", "courses_or_instructor")
         holder = ttk.Frame(area)
         holder.pack(fill="both", expand=True, padx=8, pady=8)
+        ttk.Style(self).configure("Treeview", rowheight=ROW_HEIGHT)
         self.table = ttk.Treeview(holder, columns=cols, show="headings")
-        scroll = ttk.Scrollbar(holder, orient="vertical", command=self.table.yview)
-        self.table.configure(yscroll=scroll.set)
+        # the scrollbar moves a window over self._table_rows instead of scrolling the
+        # tree, so the tree never holds more than one screen of rows
+        self._table_scroll = ttk.Scrollbar(holder, orient="vertical", command=self._scroll_table)
+        self.table.bind("<Configure>", self._on_table_resize)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.table.bind(seq, self._on_table_wheel)
         self.table.grid(row=0, column=0, sticky="nsew")
-        scroll.grid(row=0, column=1, sticky="ns")
+        self._table_scroll.grid(row=0, column=1, sticky="ns")
         holder.columnconfigure(0, weight=1)
         holder.rowconfigure(0, weight=1)
 
@@ -322,9 +403,10 @@ class SchoolGUI(tk.Tk):
                 self.s_id.get().strip(),
             )
             self.db.add_student(obj)
+            self._picklists_dirty = True
+            self._row_added("Student", obj.student_id)
             self.s_name.set(""); self.s_age.set(""); self.s_email.set(""); self.s_id.set("")
-            self._refresh_picklists()
-            self._refresh_table()
+            self._schedule_refresh()
             messagebox.showinfo("OK", "Student added.")
         except Exception as err:
             messagebox.showerror("Error", str(err))
@@ -343,9 +425,10 @@ class SchoolGUI(tk.Tk):
                 self.i_id.get().strip(),
             )
             self.db.add_instructor(obj)
+            self._picklists_dirty = True
+            self._row_added("Instructor", obj.instructor_id)
             self.i_name.set(""); self.i_age.set(""); self.i_email.set(""); self.i_id.set("")
-            self._refresh_picklists()
-            self._refresh_table()
+            self._schedule_refresh()
             messagebox.showinfo("OK", "Instructor added.")
         except Exception as err:
             messagebox.showerror("Error", str(err))
@@ -362,16 +445,21 @@ class SchoolGUI(tk.Tk):
         try:
             cid = self.c_id.get().strip()
             cname = self.c_name.get().strip()
-            label = self.c_instructor_pick.get().strip()
-            instr_id = label.split(" — ")[0] if label else None
-
-            obj = Course(cid, cname, None)   # no instructor object here
-            self.db.add_course(obj)
-            if instr_id:
-                self.db.set_course_instructor(cid, instr_id)
+            instr_id = self._instr_label_to_id.get(self.c_instructor_pick.get())
+
+            # the instructor goes into the same INSERT, so the course is never
+            # stored half-linked and a single statement is committed
+            instr = self.db.get_instructor(instr_id)
+            self.db.add_course(Course(cid, cname, instr))
+            self._picklists_dirty = True
+            if instr:
+                # the instructor's row now lists this course as well
+                self._rows_dirty = True
+            else:
+                self._row_added("Course", cid)
 
             self.c_id.set(""); self.c_name.set(""); self.c_instructor_pick.set("")
-            self._refresh_picklists(); self._refresh_table()
+            self._schedule_refresh()
             messagebox.showinfo("OK", "Course added.")
         except Exception as err:
             messagebox.showerror("Error", str(err))
@@ -380,14 +468,17 @@ class SchoolGUI(tk.Tk):
         """
         Register a student to a course using the pick lists.
 
+        The pair is queued and confirmed once written, see :meth:`_flush_pending`.
+
         :return: None
         """
         try:
-            sid = self.reg_student_pick.get().split(" — ")[0].strip()
-            cid = self.reg_course_pick.get().split(" — ")[0].strip()
-            self.db.enroll(cid, sid)
-            self._refresh_table()
-            messagebox.showinfo("OK", "Student registered.")
+            sid = self._student_label_to_id.get(self.reg_student_pick.get(), "")
+            cid = self._course_label_to_id.get(self.reg_course_pick.get(), "")
+            if not sid or not cid:
+                raise ValueError("Pick a student and a course.")
+            self._pending_enrollments.append((sid, cid))
+            self._schedule_refresh()
         except Exception as err:
             messagebox.showerror("Error", str(err))
 
@@ -395,14 +486,17 @@ class SchoolGUI(tk.Tk):
         """
         Assign an instructor to a course using the pick lists.
 
+        The pair is queued and confirmed once written, see :meth:`_flush_pending`.
+
         :return: None
         """
         try:
-            iid = self.asg_instr_pick.get().split(" — ")[0].strip()
-            cid = self.asg_course_pick.get().split(" — ")[0].strip()
-            self.db.assign_instructor(cid, iid)
-            self._refresh_table()
-            messagebox.showinfo("OK", "Instructor assigned.")
+            iid = self._instr_label_to_id.get(self.asg_instr_pick.get(), "")
+            cid = self._course_label_to_id.get(self.asg_course_pick.get(), "")
+            if not iid or not cid:
+                raise ValueError("Pick an instructor and a course.")
+            self._pending_assignments.append((iid, cid))
+            self._schedule_refresh()
         except Exception as err:
             messagebox.showerror("Error", str(err))
 
@@ -418,15 +512,82 @@ class SchoolGUI(tk.Tk):
         self.search_text.set("")
         self._refresh_table()
 
+    def _schedule_refresh(self):
+        """
+        Refresh pick lists and table once the event loop is idle.
+
+        Several writes in a row (or before Tk gets to run) share one refresh.
+
+        :return: None
+        """
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.after_idle(self._do_refresh)
+
+    def _do_refresh(self):
+        """
+        Run the refresh queued by :meth:`_schedule_refresh`.
+
+        :return: None
+        """
+        self._refresh_scheduled = False
+        self._flush_pending()
+        self._refresh_picklists()
+        if self._rows_dirty:
+            self._refresh_table()
+
+    def _flush_pending(self):
+        """
+        Write the queued registrations and assignments, one ``executemany`` each.
+
+        The written pairs are confirmed afterwards. Pairs whose student, course or
+        instructor was deleted in the meantime are skipped by the DB and listed in
+        an error box; the other pairs of the batch are still saved.
+
+        :return: None
+        """
+        batches = (
+            (self._pending_enrollments, self.db.register_students_bulk, "Registered {} in {}"),
+            (self._pending_assignments, self.db.assign_instructors_bulk, "Assigned {} to {}"),
+        )
+        done, failed = [], []
+        for pending, write, line in batches:
+            if not pending:
+                continue
+            pairs = pending[:]
+            pending.clear()
+            try:
+                skipped = write(pairs)
+            except Exception as err:
+                failed += [f"{line.format(*pair)}: {err}" for pair in pairs]
+                continue
+            self._rows_dirty = True
+            skipped_set = set(skipped)
+            done += [line.format(*pair) for pair in pairs if pair not in skipped_set]
+            failed += [f"{line.format(*pair)}: record no longer exists" for pair in skipped]
+        if done:
+            messagebox.showinfo("OK", "\n".join(done))
+        if failed:
+            messagebox.showerror("Not saved", "\n".join(failed))
+
     def _refresh_picklists(self):
         """
         Fill all comboboxes (students, courses, instructors) from the DB.
 
         :return: None
         """
-        students = [f"{s['student_id']} — {s['name']}" for s in self.db.get_students()]
-        courses = [f"{c['course_id']} — {c['course_name']}" for c in self.db.get_courses()]
-        instrs = [f"{i['instructor_id']} — {i['name']}" for i in self.db.get_instructors()]
+        if not self._picklists_dirty:
+            return
+        self._picklists_dirty = False
+
+        # one call for all three kinds; each list is shared by the boxes showing it
+        student_pairs, course_pairs, instr_pairs = self.db.get_all_picklists()
+        students, courses, instrs = (
+            [f"{key} — {name}" for key, name in pairs] for pairs in (student_pairs, course_pairs, instr_pairs))
+        # label -> id, so the click handlers look the id up instead of parsing the label
+        self._student_label_to_id = {label: key for label, (key, _) in zip(students, student_pairs)}
+        self._course_label_to_id = {label: key for label, (key, _) in zip(courses, course_pairs)}
+        self._instr_label_to_id = {label: key for label, (key, _) in zip(instrs, instr_pairs)}
 
         if hasattr(self, "reg_student_pick"):
             self.reg_student_pick["values"] = students
@@ -452,13 +613,137 @@ class SchoolGUI(tk.Tk):
         if not hasattr(self, "table"):
             return
 
-        for row_id in self.table.get_children():
-            self.table.delete(row_id)
+        if self._rows_dirty:
+            # a private copy: _row_added / _row_removed edit it in place
+            self._rows_cache = list(self.db.view_rows_fast())
+            # "\x1f" between cells keeps a query from matching across two fields
+            self._rows_haystack = ["\x1f".join(map(str, row)).lower() for row in self._rows_cache]
+            self._rows_dirty = False
+            self._table_matches = None
 
         q = self.search_text.get().strip().lower()
-        for row in self.db.view_rows():
-            if not q or any(q in str(cell).lower() for cell in row):
-                self.table.insert("", "end", values=row)
+        if self._table_matches is not None and self._table_query in q:
+            candidates = self._table_matches
+        else:
+            candidates = zip(self._rows_cache, self._rows_haystack)
+        pairs = [pair for pair in candidates if q in pair[1]]
+        if q != self._table_query:
+            self._table_top = 0
+        self._table_query, self._table_matches = q, pairs
+        self._table_rows = [row for row, _ in pairs]
+        self._render_window()
+
+    def _render_window(self):
+        """
+        Fill the table with the rows of ``_table_rows`` that fit on screen.
+
+        The scrollbar is set to the window's position in the whole list.
+
+        :return: None
+        """
+        rows = self._table_rows
+        n, visible = len(rows), self._table_visible
+        top = self._table_top = max(0, min(self._table_top, n - visible))
+        self.table.delete(*self.table.get_children())
+        insert = self.table.insert
+        for row in rows[top:top + visible]:
+            insert("", "end", values=row)
+        if n:
+            self._table_scroll.set(top / n, min(1.0, (top + visible) / n))
+        else:
+            self._table_scroll.set(0.0, 1.0)
+
+    def _scroll_table(self, action, amount, unit=None):
+        """
+        Scrollbar command: move the window to a fraction or by units / pages.
+
+        :return: None
+        """
+        if action == "moveto":
+            self._table_top = int(float(amount) * len(self._table_rows))
+        else:
+            step = self._table_visible if unit == "pages" else 1
+            self._table_top += int(amount) * step
+        self._render_window()
+
+    def _on_table_wheel(self, event):
+        """
+        Scroll the window by three rows per wheel step (``<Button-4/5>`` on X11).
+
+        :return: ``"break"``, so the tree does not scroll itself as well.
+        """
+        up = event.num == 4 or event.delta > 0
+        self._scroll_table("scroll", -3 if up else 3, "units")
+        return "break"
+
+    def _on_table_resize(self, event):
+        """
+        Recount the rows that fit under the heading and redraw if it changed.
+
+        :return: None
+        """
+        children = self.table.get_children()
+        bbox = self.table.bbox(children[0]) if children else None
+        head = bbox[1] if bbox else ROW_HEIGHT
+        visible = max(1, (event.height - head) // ROW_HEIGHT)
+        if visible != self._table_visible:
+            self._table_visible = visible
+            self._render_window()
+
+    def _row_added(self, kind, key):
+        """
+        Add the row of a record that was just created, without rebuilding the table.
+
+        The new record must have no links yet, so no other row changes. Rows
+        stay grouped by type, so the new one goes after the last row of its type.
+        If the cache is already stale, the next refresh rebuilds it instead.
+
+        :param kind: ``"Student"``, ``"Instructor"`` or ``"Course"``.
+        :param key: id of the new record.
+        :return: None
+        """
+        if self._rows_dirty:
+            return
+        self._table_matches = None
+        row = self.db.view_row(kind, key)
+        hay = "\x1f".join(map(str, row)).lower()
+        # the cache matches the DB apart from this row, so the counts give its position
+        pos = len(self.db.students) - 1
+        if kind != "Student":
+            pos += len(self.db.instructors)
+        if kind == "Course":
+            pos += len(self.db.courses)
+        self._rows_cache.insert(pos, row)
+        self._rows_haystack.insert(pos, hay)
+
+        q = self._table_query
+        if not q:
+            index = pos
+        elif q in hay:
+            index = sum(q in h for h in self._rows_haystack[:pos])
+        else:
+            return
+        self._table_rows.insert(index, row)
+        self._render_window()
+
+    def _row_removed(self, kind, key):
+        """
+        Drop the row of a deleted record from the row cache and the table.
+
+        :param kind: ``"Student"``, ``"Instructor"`` or ``"Course"``.
+        :param key: id of the deleted record.
+        :return: None
+        """
+        self._table_rows = [row for row in self._table_rows if row[0] != kind or row[1] != key]
+        self._render_window()
+        if self._rows_dirty:
+            return
+        self._table_matches = None
+        for pos, row in enumerate(self._rows_cache):
+            if row[0] == kind and row[1] == key:
+                del self._rows_cache[pos]
+                del self._rows_haystack[pos]
+                return
 
     def _selected(self):
         """
@@ -483,11 +768,20 @@ class SchoolGUI(tk.Tk):
         pick = self._selected()
         if not pick:
             return
-        node, vals = pick
+        _, vals = pick
         rtype, rid = str(vals[0]), str(vals[1])
 
         if not messagebox.askyesno("Confirm", f"Delete {rtype} {rid}?"):
             return
+        # other rows show this record only through its links: a student is never
+        # listed elsewhere, an instructor or course only while it has links
+        linked = None
+        if rtype == "Instructor":
+            instr = self.db.instructors.get(rid)
+            linked = instr and instr.assigned_courses
+        elif rtype == "Course":
+            c = self.db.courses.get(rid)
+            linked = c and (c.enrolled_students or c.instructor)
         try:
             if rtype == "Student":
                 self.db.delete_student(rid)
@@ -495,9 +789,11 @@ class SchoolGUI(tk.Tk):
                 self.db.delete_instructor(rid)
             elif rtype == "Course":
                 self.db.delete_course(rid)
-            self.table.delete(node)
-            self._refresh_picklists()
-            self._refresh_table()
+            self._picklists_dirty = True
+            if linked:
+                self._rows_dirty = True
+            self._row_removed(rtype, rid)
+            self._schedule_refresh()
         except Exception as err:
             messagebox.showerror("Error", str(err))
 
@@ -519,6 +815,8 @@ class SchoolGUI(tk.Tk):
 
         :return: None
         """
+        self._flush_pending()
+        self._io_pool.shutdown(wait=True)
         try:
             self.db.close()
         except Exception:
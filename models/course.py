@@ -1,30 +1,64 @@
 from __future__ import annotations
-from typing import List
+from typing import Dict, Optional
+from operator import attrgetter
 from .instructor import Instructor
 from .student import Student
 
+# id getter for to_dict: map() over it runs the loop in C
+_student_id = attrgetter("student_id")
+
 class Course:
     """Class representing a course with attributes and methods for managing enrolled students and instructor.
     Attributes: 
     course_id (str): The unique identifier for the course.
     course_name (str): The name of the course.
-    instructor (Instructor | None): The instructor assigned to the course, can be None.
-    enrolled_students (List[Student]): List of students enrolled in the course.
+    instructor_id (str | None): The id of the assigned instructor, can be None.
+    instructor (Instructor | None): The assigned instructor, resolved from ``instructor_id``.
+    enrolled_students (Dict[Student, None]): Students enrolled in the course, as an insertion-ordered set.
     Args:
         course_id (str): The unique identifier for the course.
         course_name (str): The name of the course.
         instructor (Instructor | None): The instructor assigned to the course, can be None."""
+    __slots__ = ("course_id", "course_name", "instructor_id", "enrolled_students",
+                 "_combo_label", "_instructors", "_instructor", "_extra_cache")
+
     def __init__(self, course_id: str, course_name: str, instructor: Instructor | None):
         self.course_id = course_id
         self.course_name = course_name
+        # "id | name" as listed in the GUI comboboxes; refreshed by the db on edits
+        self._combo_label = f"{course_id} | {course_name}"
+        self._instructors: Optional[Dict[str, Instructor]] = None
+        # display string built by the GUIs; cleared whenever instructor or roster change
+        self._extra_cache: str | None = None
         self.instructor = instructor
-        self.enrolled_students: List[Student] = []
+        self.enrolled_students: Dict[Student, None] = {}
+
+    def bind_instructors(self, instructors: Dict[str, Instructor]):
+        """Resolve ``instructor`` by id through the given id -> Instructor mapping.
+        Once bound, the course keeps only ``instructor_id`` instead of an object reference.
+        Args:
+            instructors (Dict[str, Instructor]): The mapping owned by the database cache."""
+        self._instructors = instructors
+        self._instructor = None
+
+    @property
+    def instructor(self) -> Instructor | None:
+        """The assigned instructor, or None."""
+        if self._instructors is not None:
+            return self._instructors.get(self.instructor_id) if self.instructor_id else None
+        return self._instructor
+
+    @instructor.setter
+    def instructor(self, instructor: Instructor | None):
+        self.instructor_id = instructor.instructor_id if instructor else None
+        self._instructor = instructor if self._instructors is None else None
+        self._extra_cache = None
 
     def add_student(self, student: Student):
         """Adds a student to the course if not already enrolled.
-        The method checks if the student is already in the enrolled students list before adding them."""
-        if student not in self.enrolled_students:
-            self.enrolled_students.append(student)
+        Membership is a dict lookup, so enrolling twice is a no-op and keeps the original order."""
+        self.enrolled_students.setdefault(student)
+        self._extra_cache = None
 
     def to_dict(self) -> dict:
         """Serializes the course object to a dictionary, including relevant attributes.
@@ -33,8 +67,8 @@ class Course:
         return {
             "course_id": self.course_id,
             "course_name": self.course_name,
-            "instructor_id": self.instructor.instructor_id if self.instructor else None,
-            "enrolled_student_ids": [s.student_id for s in self.enrolled_students],
+            "instructor_id": self.instructor_id,
+            "enrolled_student_ids": list(map(_student_id, self.enrolled_students)),
         }
 
     @classmethod
@@ -1,36 +1,47 @@
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import Dict, TYPE_CHECKING
+from operator import attrgetter
 from .person import Person
 if TYPE_CHECKING:
     from .course import Course 
 
+# id getter for to_dict: map() over it runs the loop in C
+_course_id = attrgetter("course_id")
+
 class Instructor(Person):
     """Class representing an instructor, inheriting from Person.
     Inherits attributes and methods from Person and adds instructor-specific attributes and methods.
     Attributes:
         instructor_id (str): The unique identifier for the instructor.
-        assigned_courses (List[Course]): List of courses the instructor is assigned to.
+        assigned_courses (Dict[Course, None]): Courses the instructor is assigned to, as an insertion-ordered set.
         Args:
             name (str): The name of the instructor.
             age (int): The age of the instructor.
             email (str): The email address of the instructor.
-            instructor_id (str): The unique identifier for the instructor."""
-    def __init__(self, name: str, age: int, email: str, instructor_id: str):
-        super().__init__(name, age, email)
+            instructor_id (str): The unique identifier for the instructor.
+            validate (bool): Check age and email; False for rows already stored."""
+    __slots__ = ("instructor_id", "assigned_courses", "_combo_label", "_extra_cache")
+
+    def __init__(self, name: str, age: int, email: str, instructor_id: str, *, validate: bool = True):
+        super().__init__(name, age, email, validate=validate)
         self.instructor_id = instructor_id
-        self.assigned_courses = []
+        self.assigned_courses: Dict["Course", None] = {}
+        # "id | name" as listed in the GUI comboboxes; refreshed by the db on edits
+        self._combo_label = f"{instructor_id} | {name}"
+        # display string built by the GUIs; cleared whenever the courses change
+        self._extra_cache: str | None = None
 
     def assign_course(self, course: "Course"):
         """Assigns the instructor to a course if not already assigned.
-        The method checks if the course is already in the instructor's assigned courses list before adding it"""
-        if course not in self.assigned_courses:
-            self.assigned_courses.append(course)
+        Membership is a dict lookup, so assigning twice is a no-op and keeps the original order."""
+        self.assigned_courses.setdefault(course)
+        self._extra_cache = None
 
     def to_dict(self) -> dict:
         base = super().to_dict()
         base.update({
             "instructor_id": self.instructor_id,
-            "assigned_course_ids": [c.course_id for c in self.assigned_courses],
+            "assigned_course_ids": list(map(_course_id, self.assigned_courses)),
         })
         return base
 
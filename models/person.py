@@ -11,10 +11,14 @@ class Person:
          Args:
              name (str): The name of the person.
              age (int): The age of the person.
-             email (str): The email address of the person."""
-    def __init__(self, name: str, age: int, email: str):
-        validate_age(age)
-        validate_email(email)
+             email (str): The email address of the person.
+             validate (bool): Check age and email; False for rows already stored."""
+    __slots__ = ("name", "age", "_email")
+
+    def __init__(self, name: str, age: int, email: str, *, validate: bool = True):
+        if validate:
+            validate_age(age)
+            validate_email(email)
         self.name = name
         self.age = age
         self._email = email
@@ -1,32 +1,43 @@
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import Dict, TYPE_CHECKING
+from operator import attrgetter
 from .person import Person
 if TYPE_CHECKING:
     from .course import Course
 
+# id getter for to_dict: map() over it runs the loop in C
+_course_id = attrgetter("course_id")
+
 class Student(Person):
     """Class representing a student, inheriting from Person.
     Inherits attributes and methods from Person and adds student-specific attributes and methods.
     Attributes:
         student_id (str): The unique identifier for the student.
-        registered_courses (List[Course]): List of courses the student is registered in.
+        registered_courses (Dict[Course, None]): Courses the student is registered in, as an insertion-ordered set.
         Args:
             name (str): The name of the student.
             age (int): The age of the student.
             email (str): The email address of the student.
-            student_id (str): The unique identifier for the student."""
-    def __init__(self, name: str, age: int, email: str, student_id: str):
-        super().__init__(name, age, email)
+            student_id (str): The unique identifier for the student.
+            validate (bool): Check age and email; False for rows already stored."""
+    __slots__ = ("student_id", "registered_courses", "_combo_label", "_extra_cache")
+
+    def __init__(self, name: str, age: int, email: str, student_id: str, *, validate: bool = True):
+        super().__init__(name, age, email, validate=validate)
         self.student_id = student_id
-        self.registered_courses: List["Course"] = []
+        self.registered_courses: Dict["Course", None] = {}
+        # "id | name" as listed in the GUI comboboxes; refreshed by the db on edits
+        self._combo_label = f"{student_id} | {name}"
+        # display string built by the GUIs; cleared whenever the courses change
+        self._extra_cache: str | None = None
 
     def register_course(self, course: "Course"):
         """Registers the student for a course if not already registered.
-        The method checks if the course is already in the student's registered courses list before adding it.
+        Membership is a dict lookup, so registering twice is a no-op and keeps the original order.
         Args:
             course (Course): The course to register the student in."""
-        if course not in self.registered_courses:
-            self.registered_courses.append(course)
+        self.registered_courses.setdefault(course)
+        self._extra_cache = None
 
     def to_dict(self) -> dict:
         """Serializes the student object to a dictionary, including inherited attributes.
@@ -35,7 +46,7 @@ class Student(Person):
         base = super().to_dict()
         base.update({
             "student_id": self.student_id,
-            "registered_course_ids": [c.course_id for c in self.registered_courses],
+            "registered_course_ids": list(map(_course_id, self.registered_courses)),
         })
         return base
 
@@ -1,6 +1,29 @@
 import re
+from functools import lru_cache
 
-EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+# Domain labels exclude ".", so the domain splits only one way at its dots;
+# \Z (unlike $) also rejects a trailing "\n".
+EMAIL_RE = re.compile(
+    r"\A[A-Za-z0-9._%+\-]{1,64}@[A-Za-z0-9\-]{1,63}(?:\.[A-Za-z0-9\-]{1,63})*\.[A-Za-z]{2,24}\Z",
+    re.ASCII)
+_email_match = EMAIL_RE.match
+# The looser pattern in use before EMAIL_RE was tightened. Addresses stored under it
+# must still load from a database or JSON snapshot, so imports check against it.
+LEGACY_EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+_legacy_email_match = LEGACY_EMAIL_RE.match
+
+@lru_cache(maxsize=4096)
+def _is_email(email: str) -> bool:
+    """True if ``email`` matches ``EMAIL_RE``. Cheap string checks (one "@" with
+    something before it, a dot after the first domain character, at most 254
+    characters) reject most malformed input before the regex runs. Results are
+    memoized, so reloading the same addresses skips the checks."""
+    if not email or len(email) > 254:
+        return False
+    at = email.find("@")
+    if at < 1 or at != email.rfind("@") or "." not in email[at + 2:]:
+        return False
+    return _email_match(email) is not None
 
 def validate_email(email: str) -> None:
     """Validates the format of an email address.
@@ -8,9 +31,21 @@ def validate_email(email: str) -> None:
     Args:
         email (str): The email address to validate.
     """
-    if not EMAIL_RE.match(email or ""):
+    if not _is_email(email):
         raise ValueError("Invalid email format.")
 
+def validate_emails_bulk(emails, legacy: bool = False) -> None:
+    """Validates a batch of email addresses in one pass.
+    Raises a ValueError naming the first invalid address.
+    Args:
+        emails (Iterable[str]): The email addresses to validate.
+        legacy (bool): Check against ``LEGACY_EMAIL_RE`` instead of ``EMAIL_RE``,
+            for addresses that were stored before the stricter pattern.
+    """
+    for email in emails:
+        if not (_legacy_email_match(email or "") if legacy else _is_email(email)):
+            raise ValueError(f"Invalid email format: {email!r}")
+
 def validate_age(age: int) -> None:
     """Validates the age of a person.
     Raises a ValueError if the age is not a non-negative integer.
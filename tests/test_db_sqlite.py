@@ -0,0 +1,409 @@
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from data.db_sqlite import SchoolDBSqlite
+from models.course import Course
+from models.instructor import Instructor
+from models.student import Student
+
+
+def snapshot(db):
+    """Plain-data view of the object cache, relations sorted by id."""
+    return (
+        {sid: (s.name, s.age, s._email, sorted(c.course_id for c in s.registered_courses))
+         for sid, s in db.students.items()},
+        {iid: (i.name, i.age, i._email, sorted(c.course_id for c in i.assigned_courses))
+         for iid, i in db.instructors.items()},
+        {cid: (c.course_name, c.instructor_id, sorted(s.student_id for s in c.enrolled_students))
+         for cid, c in db.courses.items()},
+    )
+
+
+class DBTestCase(unittest.TestCase):
+    """A fresh database file per test, with a small linked school in it."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "school.db")
+        self.db = SchoolDBSqlite(self.path)
+        db = self.db
+        db.add_student(Student("Alice", 20, "alice@x.com", "s1"))
+        db.add_student(Student("Bob", 21, "bob@x.com", "s2"))
+        db.add_instructor(Instructor("Ivy", 40, "ivy@x.com", "i1"))
+        db.add_instructor(Instructor("Jon", 41, "jon@x.com", "i2"))
+        db.add_course(Course("c1", "Math", db.instructors["i1"]))
+        db.add_course(Course("c2", "Biology", db.instructors["i1"]))
+        db.add_course(Course("c3", "Chemistry", None))
+        db.register_student_in_course("s1", "c1")
+        db.register_student_in_course("s1", "c2")
+        db.register_student_in_course("s2", "c1")
+
+    def tearDown(self):
+        self.db.close()
+        self.dir.cleanup()
+
+    def assertCacheMatchesDB(self):
+        """The incrementally maintained cache equals one rebuilt from SQL."""
+        fresh = SchoolDBSqlite(self.path)
+        try:
+            self.assertEqual(snapshot(self.db), snapshot(fresh))
+        finally:
+            fresh.close()
+        # relations must point both ways
+        for s in self.db.students.values():
+            for c in s.registered_courses:
+                self.assertIn(s, c.enrolled_students)
+        for i in self.db.instructors.values():
+            for c in i.assigned_courses:
+                self.assertIs(c.instructor, i)
+
+
+class LegacyEmailTest(unittest.TestCase):
+    """Addresses accepted by the old email pattern must still load."""
+
+    LEGACY = "a@x..com"
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "school.db")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_reopen_database_with_legacy_address(self):
+        db = SchoolDBSqlite(self.path)
+        db.close()
+        # written straight to SQLite, as a build with the looser pattern would have
+        conn = sqlite3.connect(self.path)
+        with conn:
+            conn.execute("INSERT INTO students(student_id,name,age,email) VALUES (?,?,?,?)",
+                         ("s1", "Alice", 20, self.LEGACY))
+            conn.execute("INSERT INTO instructors(instructor_id,name,age,email) VALUES (?,?,?,?)",
+                         ("i1", "Ivy", 40, self.LEGACY))
+        conn.close()
+
+        db = SchoolDBSqlite(self.path)
+        try:
+            self.assertEqual(db.students["s1"]._email, self.LEGACY)
+            self.assertEqual(db.instructors["i1"]._email, self.LEGACY)
+        finally:
+            db.close()
+
+    def test_load_json_with_legacy_address(self):
+        path = os.path.join(self.dir.name, "school.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": 2,
+                       "students": [{"student_id": "s1", "name": "Alice", "age": 20, "email": self.LEGACY}],
+                       "instructors": [], "courses": [], "registrations": []}, f)
+        db = SchoolDBSqlite.load_json(path, self.path)
+        try:
+            self.assertEqual(db.students["s1"]._email, self.LEGACY)
+        finally:
+            db.close()
+
+    def test_new_records_use_strict_pattern(self):
+        with self.assertRaises(ValueError):
+            Student("Alice", 20, self.LEGACY, "s1")
+        with self.assertRaises(ValueError):
+            Instructor("Ivy", 40, "i@x.com\n", "i1")
+
+
+class CacheTest(DBTestCase):
+    """Every write keeps the object cache equal to a fresh ``refresh_cache``."""
+
+    def test_add(self):
+        self.db.add_student(Student("Cid", 22, "cid@x.com", "s3"))
+        self.db.add_instructor(Instructor("Kim", 42, "kim@x.com", "i3"))
+        self.db.add_course(Course("c4", "Art", self.db.instructors["i3"]))
+        self.db.register_student_in_course("s3", "c4")
+        self.db.assign_instructor_to_course("i2", "c3")
+        self.assertCacheMatchesDB()
+
+    def test_update(self):
+        self.db.update_student("s1", Student("Alicia", 23, "alicia@x.com", "s1"))
+        self.db.update_instructor("i1", Instructor("Ivo", 44, "ivo@x.com", "i1"))
+        self.db.update_course("c2", Course("c2", "Bio", self.db.instructors["i2"]))
+        self.assertCacheMatchesDB()
+        self.assertEqual(self.db.students["s1"].name, "Alicia")
+
+    def test_delete(self):
+        self.db.delete_student("s2")
+        self.assertCacheMatchesDB()
+        self.db.delete_instructor("i1")
+        self.assertCacheMatchesDB()
+        self.assertIsNone(self.db.courses["c1"].instructor)
+        self.db.delete_course("c1")
+        self.assertCacheMatchesDB()
+        self.assertEqual(list(self.db.students["s1"].registered_courses), [self.db.courses["c2"]])
+
+    def test_rename_student(self):
+        s1 = self.db.students["s1"]
+        self.db.update_student("s1", Student("Alice", 20, "alice@x.com", "s9"))
+        self.assertCacheMatchesDB()
+        self.assertIs(self.db.students["s9"], s1)
+        self.assertNotIn("s1", self.db.students)
+
+    def test_rename_instructor(self):
+        self.db.update_instructor("i1", Instructor("Ivy", 40, "ivy@x.com", "i9"))
+        self.assertCacheMatchesDB()
+        self.assertEqual(self.db.courses["c1"].instructor_id, "i9")
+
+    def test_rename_course(self):
+        self.db.update_course("c1", Course("c9", "Math", self.db.instructors["i1"]))
+        self.assertCacheMatchesDB()
+        self.assertEqual([c.course_id for c in self.db.students["s2"].registered_courses], ["c9"])
+
+    def test_name_change_keeps_assigned_order(self):
+        i1 = self.db.instructors["i1"]
+        i1._extra_cache = "c1, c2"
+        self.db.update_course("c1", Course("c1", "Math 2", i1))
+        self.assertEqual([c.course_id for c in i1.assigned_courses], ["c1", "c2"])
+        # the instructor's row lists course ids only, so its display string stays valid
+        self.assertEqual(i1._extra_cache, "c1, c2")
+        self.db.update_courses_bulk([("c1", Course("c1", "Math 3", i1))])
+        self.assertEqual([c.course_id for c in i1.assigned_courses], ["c1", "c2"])
+        self.assertCacheMatchesDB()
+
+
+class BulkTest(DBTestCase):
+    """``bulk()`` commits once, and a failure discards every write in it."""
+
+    def count(self, table):
+        return self.db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_nested_rollback(self):
+        before = snapshot(self.db)
+        with self.assertRaises(RuntimeError):
+            with self.db.bulk():
+                self.db.add_student(Student("Cid", 22, "cid@x.com", "s3"))
+                with self.db.bulk():
+                    self.db.register_student_in_course("s3", "c3")
+                    self.db.delete_course("c1")
+                    raise RuntimeError
+        self.assertFalse(self.db.conn.in_transaction)
+        self.assertEqual(snapshot(self.db), before)
+        self.assertEqual(self.count("students"), 2)
+        self.assertEqual(self.count("courses"), 3)
+        self.assertEqual(self.count("registrations"), 3)
+        self.assertCacheMatchesDB()
+
+    def test_nested_blocks_commit_once(self):
+        with self.db.bulk():
+            self.db.add_student(Student("Cid", 22, "cid@x.com", "s3"))
+            with self.db.bulk():
+                self.db.register_student_in_course("s3", "c3")
+            # the inner block joined the outer transaction and did not commit it
+            self.assertTrue(self.db.conn.in_transaction)
+        self.assertFalse(self.db.conn.in_transaction)
+        self.assertCacheMatchesDB()
+        self.assertIn("s3", self.db.students)
+
+
+class JsonTest(DBTestCase):
+    """``save_json`` / ``load_json`` round trip, and files in the old layout."""
+
+    def test_round_trip(self):
+        path = os.path.join(self.dir.name, "school.json")
+        self.db.save_json(path)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(data["version"], 2)
+        self.assertEqual(sorted((r["student_id"], r["course_id"]) for r in data["registrations"]),
+                         [("s1", "c1"), ("s1", "c2"), ("s2", "c1")])
+        self.assertNotIn("enrolled_student_ids", data["courses"][0])
+
+        loaded = SchoolDBSqlite.load_json(path, os.path.join(self.dir.name, "copy.db"))
+        try:
+            self.assertEqual(snapshot(loaded), snapshot(self.db))
+        finally:
+            loaded.close()
+
+    def test_load_into_open_database(self):
+        path = os.path.join(self.dir.name, "school.json")
+        self.db.save_json(path)
+        expected = snapshot(self.db)
+        self.db.delete_course("c1")
+        self.db.add_student(Student("Cid", 22, "cid@x.com", "s3"))
+        self.assertIs(SchoolDBSqlite.load_json(path, into=self.db), self.db)
+        self.assertEqual(snapshot(self.db), expected)
+        self.assertCacheMatchesDB()
+
+    def test_load_versionless_file(self):
+        legacy = {
+            "students": [
+                {"name": "Alice", "age": 20, "email": "alice@x.com", "student_id": "s1",
+                 "registered_course_ids": ["c1"]},
+                {"name": "Bob", "age": 21, "email": "bob@x.com", "student_id": "s2",
+                 "registered_course_ids": ["c1", "c2"]},
+            ],
+            "instructors": [
+                {"name": "Ivy", "age": 40, "email": "ivy@x.com", "instructor_id": "i1",
+                 "assigned_course_ids": ["c1"]},
+            ],
+            "courses": [
+                {"course_id": "c1", "course_name": "Math", "instructor_id": "i1",
+                 "enrolled_student_ids": ["s1", "s2", "gone"]},
+                {"course_id": "c2", "course_name": "Bio", "instructor_id": None,
+                 "enrolled_student_ids": ["s2"]},
+            ],
+        }
+        path = os.path.join(self.dir.name, "legacy.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+        loaded = SchoolDBSqlite.load_json(path, os.path.join(self.dir.name, "legacy.db"))
+        try:
+            students, instructors, courses = snapshot(loaded)
+            self.assertEqual(students, {"s1": ("Alice", 20, "alice@x.com", ["c1"]),
+                                        "s2": ("Bob", 21, "bob@x.com", ["c1", "c2"])})
+            self.assertEqual(instructors, {"i1": ("Ivy", 40, "ivy@x.com", ["c1"])})
+            # ids of students missing from the file are dropped
+            self.assertEqual(courses, {"c1": ("Math", "i1", ["s1", "s2"]),
+                                       "c2": ("Bio", None, ["s2"])})
+        finally:
+            loaded.close()
+
+
+class BulkUpdateTest(DBTestCase):
+    """``update_*_bulk`` with renames and in-place edits in one batch."""
+
+    def test_students_mixed(self):
+        self.db.update_students_bulk([
+            ("s1", Student("Alice", 20, "alice@x.com", "s9")),
+            ("s2", Student("Bobby", 22, "bobby@x.com", "s2")),
+        ])
+        self.assertCacheMatchesDB()
+        self.assertEqual(sorted(self.db.students), ["s2", "s9"])
+        self.assertEqual(self.db.students["s2"].name, "Bobby")
+        self.assertEqual(sorted(s.student_id for s in self.db.courses["c1"].enrolled_students), ["s2", "s9"])
+
+    def test_instructors_mixed(self):
+        self.db.update_instructors_bulk([
+            ("i2", Instructor("Jonny", 42, "jonny@x.com", "i2")),
+            ("i1", Instructor("Ivy", 40, "ivy@x.com", "i9")),
+        ])
+        self.assertCacheMatchesDB()
+        self.assertEqual(self.db.courses["c2"].instructor.instructor_id, "i9")
+        self.assertEqual(self.db.instructors["i2"].name, "Jonny")
+
+    def test_courses_mixed(self):
+        i1, i2 = self.db.instructors["i1"], self.db.instructors["i2"]
+        self.db.update_courses_bulk([
+            ("c1", Course("c9", "Math", i2)),
+            ("c2", Course("c2", "Bio", None)),
+            ("c3", Course("c3", "Chem", i1)),
+        ])
+        self.assertCacheMatchesDB()
+        self.assertEqual([c.course_id for c in i1.assigned_courses], ["c3"])
+        self.assertEqual([c.course_id for c in i2.assigned_courses], ["c9"])
+        self.assertEqual(self.db.courses["c2"].course_name, "Bio")
+
+    def test_failure_partway_rolls_back(self):
+        before = snapshot(self.db)
+        # the second rename collides with the first one's new id
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db.update_students_bulk([
+                ("s1", Student("Alice", 20, "alice@x.com", "s9")),
+                ("s2", Student("Bob", 21, "bob@x.com", "s9")),
+            ])
+        self.assertEqual(snapshot(self.db), before)
+        self.assertCacheMatchesDB()
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db.update_courses_bulk([
+                ("c3", Course("c3", "Chem", None)),
+                ("c1", Course("c2", "Math", None)),
+            ])
+        self.assertEqual(snapshot(self.db), before)
+        self.assertCacheMatchesDB()
+
+
+class BatchLinkTest(DBTestCase):
+    """``register_students_bulk`` / ``assign_instructors_bulk`` skip stale pairs."""
+
+    def test_register_skips_stale_pair(self):
+        self.db.add_student(Student("Cid", 22, "cid@x.com", "s3"))
+        self.db.delete_course("c2")
+        skipped = self.db.register_students_bulk([("s3", "c3"), ("s3", "c2"), ("gone", "c1"), ("s2", "c3")])
+        self.assertEqual(skipped, [("s3", "c2"), ("gone", "c1")])
+        self.assertEqual([c.course_id for c in self.db.students["s3"].registered_courses], ["c3"])
+        self.assertEqual(sorted(s.student_id for s in self.db.courses["c3"].enrolled_students), ["s2", "s3"])
+        self.assertCacheMatchesDB()
+
+    def test_assign_skips_stale_pair(self):
+        skipped = self.db.assign_instructors_bulk([("i2", "c3"), ("gone", "c1"), ("i2", "nope")])
+        self.assertEqual(skipped, [("gone", "c1"), ("i2", "nope")])
+        self.assertIs(self.db.courses["c3"].instructor, self.db.instructors["i2"])
+        # the stale pair did not touch c1's existing link
+        self.assertIs(self.db.courses["c1"].instructor, self.db.instructors["i1"])
+        self.assertCacheMatchesDB()
+
+
+class SearchTest(DBTestCase):
+    """``search`` agrees with a plain substring scan after every kind of write."""
+
+    QUERIES = ("", "a", "B", "ab", "abc", "Bca", "s1", "c1", "i", "zzz", "x a", "ca b", "s1000")
+
+    def brute(self, text):
+        t = text.lower()
+        return {
+            "students": [s for s in self.db.students.values()
+                         if t in s.name.lower() or t in s.student_id.lower()],
+            "instructors": [i for i in self.db.instructors.values()
+                            if t in i.name.lower() or t in i.instructor_id.lower()],
+            "courses": [c for c in self.db.courses.values()
+                        if t in c.course_name.lower() or t in c.course_id.lower()],
+        }
+
+    def assertSearchMatches(self):
+        for q in self.QUERIES:
+            self.assertEqual(self.db.search(q), self.brute(q), q)
+
+    def test_against_brute_force(self):
+        rnd = random.Random(7)
+        name = lambda: "".join(rnd.choice("abcAB x") for _ in range(rnd.randint(1, 7))).strip() or "a"
+        db = self.db
+        self.assertSearchMatches()
+        for k in range(40):
+            db.add_student(Student(name(), 20, "r@x.com", f"s{k + 10}"))
+            db.add_instructor(Instructor(name(), 40, "r@x.com", f"i{k + 10}"))
+            db.add_course(Course(f"c{k + 10}", name(), None))
+        self.assertSearchMatches()
+
+        # each kind written on its own, so only that kind's version stamp moves
+        db.update_student("s10", Student("Abc", 20, "r@x.com", "s10"))
+        self.assertSearchMatches()
+        db.update_instructor("i10", Instructor("Bca", 40, "r@x.com", "i1000"))
+        self.assertSearchMatches()
+        db.update_course("c10", Course("c10", "x abc", None))
+        self.assertSearchMatches()
+        db.delete_student("s11")
+        self.assertSearchMatches()
+        db.delete_instructor("i11")
+        self.assertSearchMatches()
+        db.delete_course("c11")
+        self.assertSearchMatches()
+        db.update_students_bulk([("s12", Student("Cab", 20, "r@x.com", "s12")),
+                                 ("s13", Student("abc", 20, "r@x.com", "s1000"))])
+        self.assertSearchMatches()
+
+    def test_links_keep_results_fresh(self):
+        before = self.db.search("bob")["students"]
+        # registrations and assignments skip the index rebuild
+        self.db.register_student_in_course("s2", "c3")
+        self.db.assign_instructor_to_course("i2", "c3")
+        self.db.register_students_bulk([("s2", "c2")])
+        self.db.assign_instructors_bulk([("i2", "c1")])
+        self.assertSearchMatches()
+        after = self.db.search("bob")["students"]
+        self.assertEqual(after, before)
+        self.assertEqual(sorted(c.course_id for c in after[0].registered_courses), ["c1", "c2", "c3"])
+        self.assertEqual([c.course_id for c in self.db.search("jon")["instructors"][0].assigned_courses],
+                         ["c3", "c1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
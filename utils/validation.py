@@ -1,6 +1,4 @@
-import re
-
-EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+from models.validators import EMAIL_RE
 
 def validate_email(email: str) -> None:
     if not EMAIL_RE.match(email or ""):